@@ -0,0 +1,71 @@
+"""
+onlyGen — Agent I/O helpers
+Shared by the generation agents (3, 6, 7): pulling JSON out of LLM replies,
+validating captured tool rows, and batch-persisting rows in one transaction.
+"""
+import functools
+import re
+from typing import Any, Iterable, List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+import backend.database as _db_module
+
+M = TypeVar("M", bound=BaseModel)
+
+# Fenced ```json blocks (object or array)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _bare_json_re(min_len: int) -> re.Pattern[str]:
+    return re.compile(rf"(\{{[^{{}}]{{{min_len},}}\}}|\[[^\[\]]{{{min_len},}}\])")
+
+
+def bare_json_candidates(text: str, min_len: int = 100) -> List[str]:
+    """Un-fenced flat (non-nested) JSON objects/arrays of at least ``min_len`` chars."""
+    return _bare_json_re(min_len).findall(text)
+
+
+def json_candidates(text: str, min_bare_len: int = 100) -> List[str]:
+    """JSON snippets in an LLM reply: fenced ```json blocks, else bare objects/arrays."""
+    return _FENCE_RE.findall(text) or bare_json_candidates(text, min_bare_len)
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model: Type[M]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def validate_rows(model: Type[M], rows: Iterable[dict[str, Any]]) -> List[M]:
+    """Validate tool-output rows as ``model`` instances, skipping any invalid row.
+
+    The whole list goes through one pydantic-core call; only when that fails are
+    rows validated one by one so the valid ones are kept.
+    """
+    rows = list(rows)
+    try:
+        return _list_adapter(model).validate_python(rows)
+    except ValidationError:
+        valid: List[M] = []
+        for row in rows:
+            try:
+                valid.append(model(**row))
+            except Exception:  # noqa: BLE001
+                continue
+        return valid
+
+
+async def executemany_in_tx(*batches: tuple[str, List[dict]], immediate: bool = False) -> None:
+    """Run each ``(sql, rows)`` batch in one transaction on a per-call connection."""
+    db_path = _db_module.DB_PATH
+    await _db_module.init_db(db_path)
+    async with _db_module.connect_db(db_path) as db:
+        await db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            for sql, rows in batches:
+                await db.executemany(sql, rows)
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
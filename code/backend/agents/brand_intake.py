@@ -152,14 +152,10 @@ def _run_async(coro) -> None:
     exc: list = []
 
     def worker():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            loop.run_until_complete(coro)
+            asyncio.run(coro)
         except Exception as e:
             exc.append(e)
-        finally:
-            loop.close()
 
     t = threading.Thread(target=worker, daemon=True)
     t.start()
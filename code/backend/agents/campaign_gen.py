@@ -18,19 +18,21 @@ import os
 import time
 import uuid
 from datetime import UTC, datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import aiosqlite
 import structlog
 from dotenv import load_dotenv
-from google.adk.agents import Agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types as genai_types
 from pydantic import ValidationError
 
-import backend.database as _db_module
+if TYPE_CHECKING:
+    # google-adk / google-genai take ~1s to import; runtime imports are deferred
+    # to the functions that build and run the agent, so tool/prompt/persist
+    # helpers (and tests that only use them) load without them.
+    from google.adk.agents import Agent
+
+from backend.agent_io import bare_json_candidates, executemany_in_tx
 from backend.config import settings
+from backend.jsonio import dumps as _dumps, loads as _loads
 from backend.integrations.braintrust_tracing import (
     TracedRun,
     score_brand_alignment,
@@ -114,7 +116,7 @@ def validate_campaign_concept(
     # Penalise confidence slightly if there are minor issues
     adjusted_confidence = max(0.0, confidence_score - 0.1 * len(issues))
 
-    return json.dumps(
+    return _dumps(
         {
             "is_valid": is_valid,
             "issues": issues,
@@ -155,14 +157,14 @@ def format_campaign_concepts(
           - company_id: echoed back
     """
     try:
-        raw = json.loads(concepts_json)
+        raw = _loads(concepts_json)
         if isinstance(raw, dict):
             raw = raw.get("concepts", raw.get("campaign_concepts", [raw]))
         if not isinstance(raw, list):
             raw = [raw]
     except (json.JSONDecodeError, TypeError) as exc:
         log.error("format_campaign_concepts.parse_failed", error=str(exc))
-        return json.dumps({"error": f"JSON parse failed: {exc}", "concepts": [], "count": 0})
+        return _dumps({"error": f"JSON parse failed: {exc}", "concepts": [], "count": 0})
 
     validated: List[dict] = []
     for item in raw:
@@ -193,10 +195,9 @@ def format_campaign_concepts(
             continue
 
     log.info("format_campaign_concepts.complete", count=len(validated))
-    return json.dumps(
+    return _dumps(
         {"concepts": validated, "count": len(validated), "company_id": company_id},
-        indent=2,
-        default=str,
+        indent=True,
     )
 
 
@@ -261,6 +262,26 @@ Each concept must be DISTINCT in angle, tone, and channel.
 # Agent factory
 # ──────────────────────────────────────────────────────────────────────────────
 
+def _build_agent(
+    instruction: str = "",
+    tools: Optional[List[Any]] = None,
+) -> Agent:
+    """Build the bare Campaign Generation Agent.
+
+    The model is referenced by name, so a prebuilt agent holds no event-loop-bound
+    client and can be reused across runs (see `run_campaign_agent(agent=...)`).
+    """
+    from google.adk.agents import Agent
+
+    return Agent(
+        name="campaign_generation_agent",
+        model=CAMPAIGN_GEN_MODEL,
+        description="Generates campaign concepts from brand profile and trend signals.",
+        instruction=instruction,
+        tools=tools if tools is not None else [validate_campaign_concept, format_campaign_concepts],
+    )
+
+
 def create_campaign_gen_agent(
     company: CompanyProfile,
     prompt_weights: Dict[str, Any],
@@ -273,13 +294,7 @@ def create_campaign_gen_agent(
             "Get a key at: https://aistudio.google.com/apikey"
         )
 
-    return Agent(
-        name="campaign_generation_agent",
-        model=CAMPAIGN_GEN_MODEL,
-        description="Generates campaign concepts from brand profile and trend signals.",
-        instruction=_build_instruction(company, prompt_weights, n_concepts),
-        tools=[validate_campaign_concept, format_campaign_concepts],
-    )
+    return _build_agent(instruction=_build_instruction(company, prompt_weights, n_concepts))
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -293,6 +308,7 @@ async def run_campaign_agent(
     n_concepts: int = 3,
     session_id: Optional[str] = None,
     persist: bool = True,
+    agent: Optional[Agent] = None,
 ) -> CampaignGenerationResponse:
     """Run one full Campaign Generation Agent cycle.
 
@@ -303,10 +319,16 @@ async def run_campaign_agent(
         n_concepts:     How many campaign concepts to generate (1-5).
         session_id:     Optional trace/session ID.
         persist:        Whether to save generated campaigns to SQLite.
+        agent:          Optional prebuilt agent (from `_build_agent`) to reuse across
+                        runs; it is copied with this run's instruction and tools.
 
     Returns:
         CampaignGenerationResponse with a list of CampaignConcept objects.
     """
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types as genai_types
+
     weights = prompt_weights or {}
     n_concepts = max(1, min(5, n_concepts))
 
@@ -318,7 +340,7 @@ async def run_campaign_agent(
     def _capturing_format(concepts_json: str, company_id: str, trend_signal_id: str) -> str:
         result = format_campaign_concepts(concepts_json, company_id, trend_signal_id)
         try:
-            data = json.loads(result)
+            data = _loads(result)
             for c in data.get("concepts", []):
                 try:
                     _tool_captured.append(CampaignConcept(**c))
@@ -328,13 +350,12 @@ async def run_campaign_agent(
             pass
         return result
 
-    agent = Agent(
-        name="campaign_generation_agent",
-        model=CAMPAIGN_GEN_MODEL,
-        description="Generates campaign concepts from brand profile and trend signals.",
-        instruction=_build_instruction(company, weights, n_concepts),
-        tools=[validate_campaign_concept, _capturing_format],
-    )
+    instruction = _build_instruction(company, weights, n_concepts)
+    tools = [validate_campaign_concept, _capturing_format]
+    if agent is None:
+        agent = _build_agent(instruction=instruction, tools=tools)
+    else:
+        agent = agent.model_copy(update={"instruction": instruction, "tools": tools})
     session_service = InMemorySessionService()
     runner = Runner(
         agent=agent,
@@ -459,8 +480,7 @@ async def run_campaign_agent(
         await _attach_media_assets(concepts, company)
 
     if persist and concepts:
-        await _persist_campaigns(concepts)
-        await _persist_agent_traces(
+        await _persist_all(
             concepts=concepts,
             company=company,
             signals=signals,
@@ -516,19 +536,91 @@ def _build_user_prompt(
     n_concepts: int,
 ) -> str:
     """Format the trend signals into a structured user message."""
-    lines = [
-        f"Generate {n_concepts} campaign concept(s) for {company.name} based on these trend signal(s):\n"
+    # Key the cache on the rendered values, not ids, so refreshed signals re-render.
+    rows = tuple(
+        (
+            sig.title,
+            sig.category or "general",
+            sig.probability,
+            sig.probability_momentum,
+            sig.volume,
+            sig.relevance_scores.get(company.id, 0.5),
+        )
+        for sig in signals
+    )
+    return _render_user_prompt(company.name, n_concepts, rows)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_user_prompt(
+    company_name: str,
+    n_concepts: int,
+    rows: tuple[tuple[str, str, float, float, float, float], ...],
+) -> str:
+    """Render the user prompt from hashable signal rows (memoised)."""
+    parts = [
+        f"Generate {n_concepts} campaign concept(s) for {company_name} based on these trend signal(s):\n"
     ]
-    for i, sig in enumerate(signals, 1):
-        relevance = sig.relevance_scores.get(company.id, 0.5)
-        lines.append(f"## Signal {i}: {sig.title}")
-        lines.append(f"   Category   : {sig.category or 'general'}")
-        lines.append(f"   Probability: {sig.probability:.0%}")
-        lines.append(f"   Momentum   : {sig.probability_momentum:+.2f} (positive = rising)")
-        lines.append(f"   Volume     : ${sig.volume:,.0f}" if sig.volume else "   Volume     : N/A")
-        lines.append(f"   Relevance  : {relevance:.0%} to {company.name}")
-        lines.append("")
-    return "\n".join(lines)
+    parts.extend(
+        f"## Signal {i}: {title}\n"
+        f"   Category   : {category}\n"
+        f"   Probability: {probability:.0%}\n"
+        f"   Momentum   : {momentum:+.2f} (positive = rising)\n"
+        + (f"   Volume     : ${volume:,.0f}\n" if volume else "   Volume     : N/A\n")
+        + f"   Relevance  : {relevance:.0%} to {company_name}\n"
+        for i, (title, category, probability, momentum, volume, relevance) in enumerate(rows, 1)
+    )
+    return "\n".join(parts)
+
+
+def _find_json_span(text: str, start: int = 0) -> Optional[tuple[int, int]]:
+    """Locate the next fenced JSON value at or after ``start``.
+
+    Finds a ``` fence, then walks forward from the first ``{``/``[`` tracking
+    bracket depth (ignoring brackets inside string literals and escaped quotes)
+    until depth returns to zero. Single pass, no backtracking.
+
+    Returns:
+        ``(begin, end)`` slice bounds of the JSON value, or None if no complete
+        value follows a fence.
+    """
+    while True:
+        fence = text.find("```", start)
+        if fence == -1:
+            return None
+        i = fence + 3
+        if text.startswith("json", i):
+            i += 4
+        n = len(text)
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n or text[i] not in "{[":
+            start = fence + 3
+            continue
+
+        begin = i
+        depth = 0
+        in_string = False
+        escaped = False
+        while i < n:
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in "{[":
+                depth += 1
+            elif ch in "}]":
+                depth -= 1
+                if depth == 0:
+                    return begin, i + 1
+            i += 1
+        return None
 
 
 def _extract_concepts_from_response(
@@ -541,19 +633,20 @@ def _extract_concepts_from_response(
     The `format_campaign_concepts` tool already validated and returned a JSON
     payload; the LLM may echo it in its final message.
     """
-    import re
-
     primary_signal_id = signals[0].id if signals else "unknown"
 
     # Try JSON code blocks first
-    json_pattern = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", re.MULTILINE)
-    candidates = json_pattern.findall(text)
+    candidates: List[str] = []
+    pos = 0
+    while (span := _find_json_span(text, pos)) is not None:
+        candidates.append(text[span[0]:span[1]])
+        pos = span[1]
     if not candidates:
-        candidates = re.findall(r"(\{[^{}]{100,}\}|\[[^\[\]]{100,}\])", text)
+        candidates = bare_json_candidates(text)
 
     for candidate in candidates:
         try:
-            data = json.loads(candidate)
+            data = _loads(candidate)
             raw_list = (
                 data.get("concepts", data.get("campaign_concepts", []))
                 if isinstance(data, dict)
@@ -651,29 +744,24 @@ def _run_safety_checks(
     return concepts
 
 
+_INSERT_CAMPAIGN_SQL = """
+    INSERT OR REPLACE INTO campaigns
+        (id, company_id, trend_signal_id, headline, body_copy,
+         visual_direction, visual_asset_url, confidence_score,
+         channel_recommendation, channel_reasoning,
+         safety_score, safety_passed, status, created_at)
+    VALUES
+        (:id, :company_id, :trend_signal_id, :headline, :body_copy,
+         :visual_direction, :visual_asset_url, :confidence_score,
+         :channel_recommendation, :channel_reasoning,
+         :safety_score, :safety_passed, :status, :created_at)
+"""
+
+
 async def _persist_campaigns(concepts: List[CampaignConcept]) -> None:
-    """Write CampaignConcept objects to the campaigns SQLite table."""
-    db_path = _db_module.DB_PATH
-    await _db_module.init_db(db_path)
-    async with aiosqlite.connect(db_path) as db:
-        for concept in concepts:
-            row = concept.to_db_row()
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO campaigns
-                    (id, company_id, trend_signal_id, headline, body_copy,
-                     visual_direction, visual_asset_url, confidence_score,
-                     channel_recommendation, channel_reasoning,
-                     safety_score, safety_passed, status, created_at)
-                VALUES
-                    (:id, :company_id, :trend_signal_id, :headline, :body_copy,
-                     :visual_direction, :visual_asset_url, :confidence_score,
-                     :channel_recommendation, :channel_reasoning,
-                     :safety_score, :safety_passed, :status, :created_at)
-                """,
-                row,
-            )
-        await db.commit()
+    """Write CampaignConcept objects to the campaigns SQLite table in one transaction."""
+    rows = [concept.to_db_row() for concept in concepts]
+    await executemany_in_tx((_INSERT_CAMPAIGN_SQL, rows))
     log.info("campaigns_persisted", count=len(concepts))
 
 
@@ -689,37 +777,82 @@ def _extract_braintrust_trace_id(bt_span: Any) -> str | None:
     return None
 
 
-async def _persist_agent_traces(
+_INSERT_AGENT_TRACE_SQL = """
+    INSERT OR REPLACE INTO agent_traces
+        (id, agent_name, braintrust_trace_id, company_id,
+         input_summary, output_summary, quality_score,
+         tokens_used, latency_ms, created_at)
+    VALUES
+        (:id, :agent_name, :braintrust_trace_id, :company_id,
+         :input_summary, :output_summary, :quality_score,
+         :tokens_used, :latency_ms, :created_at)
+"""
+
+
+def _agent_trace_rows(
     concepts: List[CampaignConcept],
     company: CompanyProfile,
     signals: List[TrendSignal],
     latency_ms: int,
     braintrust_trace_id: str | None = None,
-) -> None:
-    """Persist one agent trace row per generated concept."""
+) -> List[dict]:
+    """Build one agent_traces row per generated concept."""
     signal_titles = ", ".join(s.title for s in signals[:3])
-    for concept in concepts:
-        quality_score = score_campaign_concept(concept)
-        row = {
+    input_summary = (
+        f"company={company.id}; n_signals={len(signals)}; "
+        f"signal_titles={signal_titles}"
+    )
+    created_at = datetime.now(UTC).isoformat()
+    return [
+        {
             "id": str(uuid.uuid4()),
             "agent_name": "campaign_gen",
             "braintrust_trace_id": braintrust_trace_id,
             "company_id": company.id,
-            "input_summary": (
-                f"company={company.id}; n_signals={len(signals)}; "
-                f"signal_titles={signal_titles}"
-            ),
+            "input_summary": input_summary,
             "output_summary": (
                 f"campaign_id={concept.id}; headline={concept.headline}; "
                 f"channel={concept.channel_recommendation.value}; "
                 f"safety_passed={concept.safety_passed}"
             ),
-            "quality_score": quality_score,
+            "quality_score": score_campaign_concept(concept),
             "tokens_used": None,
             "latency_ms": latency_ms,
-            "created_at": datetime.now(UTC).isoformat(),
+            "created_at": created_at,
         }
-        await _db_module.insert_agent_trace(row, db_path=_db_module.DB_PATH)
+        for concept in concepts
+    ]
+
+
+async def _persist_agent_traces(
+    concepts: List[CampaignConcept],
+    company: CompanyProfile,
+    signals: List[TrendSignal],
+    latency_ms: int,
+    braintrust_trace_id: str | None = None,
+) -> None:
+    """Persist one agent trace row per generated concept in a single transaction."""
+    rows = _agent_trace_rows(concepts, company, signals, latency_ms, braintrust_trace_id)
+    await executemany_in_tx((_INSERT_AGENT_TRACE_SQL, rows))
+    log.info("agent_traces_persisted", count=len(concepts), agent="campaign_gen")
+
+
+async def _persist_all(
+    concepts: List[CampaignConcept],
+    company: CompanyProfile,
+    signals: List[TrendSignal],
+    latency_ms: int,
+    braintrust_trace_id: str | None = None,
+) -> None:
+    """Persist campaigns and their agent trace rows in a single write transaction."""
+    campaign_rows = [concept.to_db_row() for concept in concepts]
+    trace_rows = _agent_trace_rows(concepts, company, signals, latency_ms, braintrust_trace_id)
+    await executemany_in_tx(
+        (_INSERT_CAMPAIGN_SQL, campaign_rows),
+        (_INSERT_AGENT_TRACE_SQL, trace_rows),
+        immediate=True,
+    )
+    log.info("campaigns_persisted", count=len(concepts))
     log.info("agent_traces_persisted", count=len(concepts), agent="campaign_gen")
 
 
@@ -18,9 +18,8 @@ import re
 import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import aiosqlite
 import structlog
 from dotenv import load_dotenv
 from google.adk.agents import Agent
@@ -28,8 +27,9 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types as genai_types
 
-import backend.database as _db_module
+from backend.agent_io import executemany_in_tx, json_candidates, validate_rows
 from backend.config import settings
+from backend.jsonio import dumps as _dumps, loads as _loads
 from backend.integrations.braintrust_tracing import TracedRun
 from backend.integrations.datadog_metrics import track_agent_run
 from backend.integrations.gemini_media import generate_image_asset, generate_video_asset
@@ -50,6 +50,11 @@ PRODUCTION_MODEL = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
 
 _VALID_TYPES = {t.value for t in ContentType}
 
+_clock = time.perf_counter  # runner latency clock, as in content_strategy
+
+# Single case-insensitive pass instead of lower()-ing the body once per marker.
+_PLACEHOLDER_RE = re.compile(r"\[placeholder\]|lorem ipsum", re.IGNORECASE)
+
 _LENGTH_GUIDELINES = {
     "tweet_thread": "Each tweet ≤280 characters. 3-8 tweets. Number them [1/N]. First tweet is the hook.",
     "linkedin_article": "800-1500 words. Use subheadings. Professional but engaging. Include a call-to-action.",
@@ -82,6 +87,16 @@ def validate_content_piece(
     Returns:
         JSON with is_valid, issues list, and quality_score.
     """
+    return _dumps(validate_content_piece_obj(content_type, title, body, word_count))
+
+
+def validate_content_piece_obj(
+    content_type: str,
+    title: str,
+    body: str,
+    word_count: int,
+) -> dict:
+    """Dict-returning core of validate_content_piece."""
     issues: list[str] = []
 
     if not title or not title.strip():
@@ -99,17 +114,17 @@ def validate_content_piece(
     elif ct == "linkedin_article" and word_count < 200:
         issues.append(f"LinkedIn article too short ({word_count} words, aim for 800+)")
 
-    if "[placeholder]" in body.lower() or "lorem ipsum" in body.lower():
+    if _PLACEHOLDER_RE.search(body):
         issues.append("Contains placeholder text")
 
     quality = max(0.0, 1.0 - 0.15 * len(issues))
 
-    return json.dumps({
+    return {
         "is_valid": len(issues) == 0,
         "issues": issues,
         "quality_score": round(quality, 3),
         "message": "Content passes quality checks." if not issues else f"{len(issues)} issue(s): {'; '.join(issues)}",
-    })
+    }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -133,15 +148,28 @@ def format_content_output(
     Returns:
         JSON with validated pieces and count.
     """
+    return _dumps(
+        format_content_output_obj(content_json, strategy_id, campaign_id, company_id),
+        indent=True,
+    )
+
+
+def format_content_output_obj(
+    content: Any,
+    strategy_id: str,
+    campaign_id: str,
+    company_id: str,
+) -> dict:
+    """Dict-returning core of format_content_output; ``content`` may already be parsed."""
     try:
-        raw = json.loads(content_json)
+        raw = _loads(content) if isinstance(content, (str, bytes)) else content
         if isinstance(raw, dict):
             raw = raw.get("pieces", raw.get("content_pieces", [raw]))
         if not isinstance(raw, list):
             raw = [raw]
     except (json.JSONDecodeError, TypeError) as exc:
         log.error("format_content_output.parse_failed", error=str(exc))
-        return json.dumps({"error": str(exc), "pieces": [], "count": 0})
+        return {"error": str(exc), "pieces": [], "count": 0}
 
     validated: list[dict] = []
     for item in raw:
@@ -175,11 +203,7 @@ def format_content_output(
             continue
 
     log.info("format_content_output.complete", count=len(validated))
-    return json.dumps(
-        {"pieces": validated, "count": len(validated), "strategy_id": strategy_id},
-        indent=2,
-        default=str,
-    )
+    return {"pieces": validated, "count": len(validated), "strategy_id": strategy_id}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -194,8 +218,26 @@ def _build_instruction(
     content_type: str,
     target_length: str,
     tone_direction: str,
-    structure_outline: list[str],
+    structure_outline: Sequence[str],
 ) -> str:
+    return _render_instruction(
+        company_name, tone, audience, goals,
+        content_type, target_length, tone_direction, tuple(structure_outline),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _render_instruction(
+    company_name: str,
+    tone: str,
+    audience: str,
+    goals: str,
+    content_type: str,
+    target_length: str,
+    tone_direction: str,
+    structure_outline: tuple[str, ...],
+) -> str:
+    """Render the agent instruction from hashable arguments (memoised)."""
     format_guide = _LENGTH_GUIDELINES.get(content_type, "Follow standard best practices.")
     meta = CONTENT_TYPE_META.get(content_type, {})
     outline_text = "\n".join(f"  {i}. {beat}" for i, beat in enumerate(structure_outline, 1)) if structure_outline else "  (no outline provided — use best judgment)"
@@ -247,6 +289,20 @@ The content should be based on the campaign concept provided in the conversation
 # Agent factory
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _build_agent(
+    instruction: str = "",
+    tools: Optional[List[Any]] = None,
+) -> Agent:
+    """Build the bare Content Production Agent, reusable via `run_content_production_agent(agent=...)`."""
+    return Agent(
+        name="content_production_agent",
+        model=PRODUCTION_MODEL,
+        description="Generates full-length, publish-ready content from a content strategy.",
+        instruction=instruction,
+        tools=tools if tools is not None else [validate_content_piece, format_content_output],
+    )
+
+
 def create_content_production_agent(
     company_name: str,
     tone: str,
@@ -257,10 +313,7 @@ def create_content_production_agent(
     if not settings.gemini_api_key_set:
         raise EnvironmentError("GEMINI_API_KEY is not set.")
 
-    return Agent(
-        name="content_production_agent",
-        model=PRODUCTION_MODEL,
-        description="Generates full-length, publish-ready content from a content strategy.",
+    return _build_agent(
         instruction=_build_instruction(
             company_name=company_name,
             tone=tone,
@@ -271,7 +324,6 @@ def create_content_production_agent(
             tone_direction=strategy.tone_direction,
             structure_outline=strategy.structure_outline,
         ),
-        tools=[validate_content_piece, format_content_output],
     )
 
 
@@ -289,8 +341,13 @@ async def run_content_production_agent(
     goals: str = "",
     session_id: Optional[str] = None,
     persist: bool = True,
+    agent: Optional[Agent] = None,
 ) -> ContentProductionResponse:
-    """Run Agent 7 to produce full content from a strategy."""
+    """Run Agent 7 to produce full content from a strategy.
+
+    ``agent`` is an optional prebuilt agent (from `_build_agent`) reused across
+    runs; it is copied with this run's instruction and tools.
+    """
 
     captured: list[ContentPiece] = []
 
@@ -298,36 +355,27 @@ async def run_content_production_agent(
     def _capturing_format_content_output(
         content_json: str, strategy_id: str, campaign_id: str, company_id: str
     ) -> str:
-        result = format_content_output(content_json, strategy_id, campaign_id, company_id)
-        try:
-            data = json.loads(result)
-            for row in data.get("pieces", []):
-                try:
-                    captured.append(ContentPiece(**row))
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        return result
+        data = format_content_output_obj(content_json, strategy_id, campaign_id, company_id)
+        captured.extend(validate_rows(ContentPiece, data.get("pieces", [])))
+        return _dumps(data, indent=True)
 
     if not settings.gemini_api_key_set:
         raise EnvironmentError("GEMINI_API_KEY is not set.")
-    agent = Agent(
-        name="content_production_agent",
-        model=PRODUCTION_MODEL,
-        description="Generates full-length, publish-ready content from a content strategy.",
-        instruction=_build_instruction(
-            company_name=company_name,
-            tone=tone,
-            audience=audience,
-            goals=goals,
-            content_type=strategy.content_type.value,
-            target_length=strategy.target_length,
-            tone_direction=strategy.tone_direction,
-            structure_outline=strategy.structure_outline,
-        ),
-        tools=[validate_content_piece, _capturing_format_content_output],
+    instruction = _build_instruction(
+        company_name=company_name,
+        tone=tone,
+        audience=audience,
+        goals=goals,
+        content_type=strategy.content_type.value,
+        target_length=strategy.target_length,
+        tone_direction=strategy.tone_direction,
+        structure_outline=strategy.structure_outline,
     )
+    tools = [validate_content_piece, _capturing_format_content_output]
+    if agent is None:
+        agent = _build_agent(instruction=instruction, tools=tools)
+    else:
+        agent = agent.model_copy(update={"instruction": instruction, "tools": tools})
     session_service = InMemorySessionService()
     runner = Runner(agent=agent, app_name="signal", session_service=session_service)
 
@@ -351,7 +399,7 @@ async def run_content_production_agent(
         content_type=strategy.content_type.value,
         company=company_name,
     )
-    start_time = time.perf_counter()
+    start_time = _clock()
     pieces: list[ContentPiece] = []
 
     bt_input = {
@@ -374,7 +422,7 @@ async def run_content_production_agent(
             if not pieces and captured:
                 pieces = captured
 
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_production",
                 items_produced=len(pieces),
@@ -396,7 +444,7 @@ async def run_content_production_agent(
                     metadata={"latency_ms": elapsed_ms},
                 )
         except asyncio.CancelledError:
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_production",
                 items_produced=len(pieces),
@@ -412,7 +460,7 @@ async def run_content_production_agent(
             )
             raise
         except Exception as exc:  # noqa: BLE001
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_production",
                 items_produced=0,
@@ -442,14 +490,11 @@ async def run_content_production_agent(
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _extract_pieces(text: str, strategy: ContentStrategy) -> list[ContentPiece]:
-    json_pattern = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", re.MULTILINE)
-    candidates = json_pattern.findall(text)
-    if not candidates:
-        candidates = re.findall(r"(\{[^{}]{100,}\}|\[[^\[\]]{100,}\])", text)
+    candidates = json_candidates(text)
 
     for candidate in candidates:
         try:
-            data = json.loads(candidate)
+            data = _loads(candidate)
             raw_list = (
                 data.get("pieces", data.get("content_pieces", []))
                 if isinstance(data, dict)
@@ -533,28 +578,23 @@ async def _attach_media_assets(
             piece.visual_asset_url = asset.asset_url
 
 
+_INSERT_PIECE_SQL = """
+    INSERT OR REPLACE INTO content_pieces
+        (id, strategy_id, campaign_id, company_id, content_type,
+         title, body, summary, word_count, visual_prompt,
+         visual_asset_url, quality_score, brand_alignment,
+         status, created_at)
+    VALUES
+        (:id, :strategy_id, :campaign_id, :company_id, :content_type,
+         :title, :body, :summary, :word_count, :visual_prompt,
+         :visual_asset_url, :quality_score, :brand_alignment,
+         :status, :created_at)
+"""
+
+
 async def _persist_pieces(pieces: list[ContentPiece]) -> None:
-    db_path = _db_module.DB_PATH
-    await _db_module.init_db(db_path)
-    async with aiosqlite.connect(db_path) as db:
-        for piece in pieces:
-            row = piece.to_db_row()
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO content_pieces
-                    (id, strategy_id, campaign_id, company_id, content_type,
-                     title, body, summary, word_count, visual_prompt,
-                     visual_asset_url, quality_score, brand_alignment,
-                     status, created_at)
-                VALUES
-                    (:id, :strategy_id, :campaign_id, :company_id, :content_type,
-                     :title, :body, :summary, :word_count, :visual_prompt,
-                     :visual_asset_url, :quality_score, :brand_alignment,
-                     :status, :created_at)
-                """,
-                row,
-            )
-        await db.commit()
+    rows = [piece.to_db_row() for piece in pieces]
+    await executemany_in_tx((_INSERT_PIECE_SQL, rows))
     log.info("content_pieces_persisted", count=len(pieces))
 
 
@@ -19,7 +19,6 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import aiosqlite
 import structlog
 from dotenv import load_dotenv
 from google.adk.agents import Agent
@@ -27,8 +26,9 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types as genai_types
 
-import backend.database as _db_module
+from backend.agent_io import executemany_in_tx, json_candidates, validate_rows
 from backend.config import settings
+from backend.jsonio import dumps as _dumps, loads as _loads
 from backend.integrations.braintrust_tracing import TracedRun
 from backend.integrations.datadog_metrics import track_agent_run
 from backend.models.content import (
@@ -47,6 +47,10 @@ STRATEGY_MODEL = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
 
 _VALID_TYPES = {t.value for t in ContentType}
 
+# Latency clock for the runner; tests patch this rather than the global time module.
+_clock = time.perf_counter
+
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool 1 — score_content_format
@@ -72,6 +76,19 @@ def score_content_format(
     Returns:
         JSON string with composite score and breakdown.
     """
+    return _dumps(score_content_format_obj(
+        content_type, audience_fit, channel_alignment, production_complexity, reasoning
+    ))
+
+
+def score_content_format_obj(
+    content_type: str,
+    audience_fit: float,
+    channel_alignment: float,
+    production_complexity: float,
+    reasoning: str,
+) -> dict:
+    """Dict-returning core of score_content_format."""
     issues: list[str] = []
 
     ct = content_type.lower().strip()
@@ -84,7 +101,7 @@ def score_content_format(
 
     composite = (audience_fit * 0.4 + channel_alignment * 0.4 + (1.0 - production_complexity) * 0.2)
 
-    return json.dumps({
+    return {
         "content_type": ct,
         "composite_score": round(composite, 3),
         "audience_fit": audience_fit,
@@ -93,7 +110,7 @@ def score_content_format(
         "reasoning": reasoning,
         "issues": issues,
         "is_valid": len(issues) == 0,
-    })
+    }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -115,15 +132,30 @@ def format_strategy_output(
     Returns:
         JSON with validated strategies and count.
     """
+    return _dumps(
+        format_strategy_output_obj(strategies_json, campaign_id, company_id),
+        indent=True,
+    )
+
+
+def format_strategy_output_obj(
+    strategies: Any,
+    campaign_id: str,
+    company_id: str,
+) -> dict:
+    """Dict-returning core of format_strategy_output.
+
+    ``strategies`` may be the raw JSON string or an already-parsed list/dict.
+    """
     try:
-        raw = json.loads(strategies_json)
+        raw = _loads(strategies) if isinstance(strategies, (str, bytes)) else strategies
         if isinstance(raw, dict):
             raw = raw.get("strategies", [raw])
         if not isinstance(raw, list):
             raw = [raw]
     except (json.JSONDecodeError, TypeError) as exc:
         log.error("format_strategy_output.parse_failed", error=str(exc))
-        return json.dumps({"error": str(exc), "strategies": [], "count": 0})
+        return {"error": str(exc), "strategies": [], "count": 0}
 
     validated: list[dict] = []
     for item in raw:
@@ -156,17 +188,14 @@ def format_strategy_output(
             continue
 
     log.info("format_strategy_output.complete", count=len(validated))
-    return json.dumps(
-        {"strategies": validated, "count": len(validated), "campaign_id": campaign_id},
-        indent=2,
-        default=str,
-    )
+    return {"strategies": validated, "count": len(validated), "campaign_id": campaign_id}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Agent instruction builder
 # ─────────────────────────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=128)
 def _build_instruction(
     company_name: str,
     industry: str,
@@ -219,6 +248,20 @@ formats ranked by expected performance. Consider:
 # Agent factory
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _build_agent(
+    instruction: str = "",
+    tools: Optional[List[Any]] = None,
+) -> Agent:
+    """Build the bare Content Strategy Agent, reusable via `run_content_strategy_agent(agent=...)`."""
+    return Agent(
+        name="content_strategy_agent",
+        model=STRATEGY_MODEL,
+        description="Decides the best content format(s) for a given campaign concept.",
+        instruction=instruction,
+        tools=tools if tools is not None else [score_content_format, format_strategy_output],
+    )
+
+
 def create_content_strategy_agent(
     company_name: str,
     industry: str,
@@ -229,12 +272,8 @@ def create_content_strategy_agent(
     if not settings.gemini_api_key_set:
         raise EnvironmentError("GEMINI_API_KEY is not set.")
 
-    return Agent(
-        name="content_strategy_agent",
-        model=STRATEGY_MODEL,
-        description="Decides the best content format(s) for a given campaign concept.",
+    return _build_agent(
         instruction=_build_instruction(company_name, industry, tone, audience, goals),
-        tools=[score_content_format, format_strategy_output],
     )
 
 
@@ -255,8 +294,13 @@ async def run_content_strategy_agent(
     goals: str = "",
     session_id: Optional[str] = None,
     persist: bool = True,
+    agent: Optional[Agent] = None,
 ) -> ContentStrategyResponse:
-    """Run Agent 6 to decide content format(s) for a campaign concept."""
+    """Run Agent 6 to decide content format(s) for a campaign concept.
+
+    ``agent`` is an optional prebuilt agent (from `_build_agent`) reused across
+    runs; it is copied with this run's instruction and tools.
+    """
 
     captured: list[ContentStrategy] = []
 
@@ -264,27 +308,18 @@ async def run_content_strategy_agent(
     def _capturing_format_strategy_output(
         strategies_json: str, campaign_id: str, company_id: str
     ) -> str:
-        result = format_strategy_output(strategies_json, campaign_id, company_id)
-        try:
-            data = json.loads(result)
-            for row in data.get("strategies", []):
-                try:
-                    captured.append(ContentStrategy(**row))
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        return result
+        data = format_strategy_output_obj(strategies_json, campaign_id, company_id)
+        captured.extend(validate_rows(ContentStrategy, data.get("strategies", [])))
+        return _dumps(data, indent=True)
 
     if not settings.gemini_api_key_set:
         raise EnvironmentError("GEMINI_API_KEY is not set.")
-    agent = Agent(
-        name="content_strategy_agent",
-        model=STRATEGY_MODEL,
-        description="Decides the best content format(s) for a given campaign concept.",
-        instruction=_build_instruction(company_name, industry, tone, audience, goals),
-        tools=[score_content_format, _capturing_format_strategy_output],
-    )
+    instruction = _build_instruction(company_name, industry, tone, audience, goals)
+    tools = [score_content_format, _capturing_format_strategy_output]
+    if agent is None:
+        agent = _build_agent(instruction=instruction, tools=tools)
+    else:
+        agent = agent.model_copy(update={"instruction": instruction, "tools": tools})
     session_service = InMemorySessionService()
     runner = Runner(agent=agent, app_name="signal", session_service=session_service)
 
@@ -302,7 +337,7 @@ async def run_content_strategy_agent(
     message = genai_types.Content(role="user", parts=[genai_types.Part(text=prompt)])
 
     log.info("content_strategy_agent_starting", campaign_id=campaign_id, company=company_name)
-    start_time = time.perf_counter()
+    start_time = _clock()
     strategies: list[ContentStrategy] = []
 
     bt_input = {
@@ -325,7 +360,7 @@ async def run_content_strategy_agent(
             if not strategies and captured:
                 strategies = captured
 
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_strategy",
                 items_produced=len(strategies),
@@ -345,7 +380,7 @@ async def run_content_strategy_agent(
                     metadata={"latency_ms": elapsed_ms},
                 )
         except asyncio.CancelledError:
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_strategy",
                 items_produced=len(strategies),
@@ -361,7 +396,7 @@ async def run_content_strategy_agent(
             )
             raise
         except Exception as exc:  # noqa: BLE001
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            elapsed_ms = int((_clock() - start_time) * 1000)
             track_agent_run(
                 agent_name="content_strategy",
                 items_produced=0,
@@ -390,16 +425,11 @@ async def run_content_strategy_agent(
 def _extract_strategies(
     text: str, campaign_id: str, company_id: str
 ) -> list[ContentStrategy]:
-    import re
-
-    json_pattern = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", re.MULTILINE)
-    candidates = json_pattern.findall(text)
-    if not candidates:
-        candidates = re.findall(r"(\{[^{}]{80,}\}|\[[^\[\]]{80,}\])", text)
+    candidates = json_candidates(text, min_bare_len=80)
 
     for candidate in candidates:
         try:
-            data = json.loads(candidate)
+            data = _loads(candidate)
             raw_list = (
                 data.get("strategies", [])
                 if isinstance(data, dict)
@@ -436,26 +466,21 @@ def _extract_strategies(
     return []
 
 
+_INSERT_STRATEGY_SQL = """
+    INSERT OR REPLACE INTO content_strategies
+        (id, campaign_id, company_id, content_type, reasoning,
+         target_length, tone_direction, structure_outline,
+         priority_score, visual_needed, created_at)
+    VALUES
+        (:id, :campaign_id, :company_id, :content_type, :reasoning,
+         :target_length, :tone_direction, :structure_outline,
+         :priority_score, :visual_needed, :created_at)
+"""
+
+
 async def _persist_strategies(strategies: list[ContentStrategy]) -> None:
-    db_path = _db_module.DB_PATH
-    await _db_module.init_db(db_path)
-    async with aiosqlite.connect(db_path) as db:
-        for strat in strategies:
-            row = strat.to_db_row()
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO content_strategies
-                    (id, campaign_id, company_id, content_type, reasoning,
-                     target_length, tone_direction, structure_outline,
-                     priority_score, visual_needed, created_at)
-                VALUES
-                    (:id, :campaign_id, :company_id, :content_type, :reasoning,
-                     :target_length, :tone_direction, :structure_outline,
-                     :priority_score, :visual_needed, :created_at)
-                """,
-                row,
-            )
-        await db.commit()
+    rows = [strat.to_db_row() for strat in strategies]
+    await executemany_in_tx((_INSERT_STRATEGY_SQL, rows))
     log.info("content_strategies_persisted", count=len(strategies))
 
 
@@ -25,9 +25,10 @@ import json
 import os
 import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiosqlite
 import structlog
@@ -71,11 +72,19 @@ FEEDBACK_MODEL = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
 # DB helper — used by all three loop tool sets
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _db_path() -> Path:
-    """Resolve the SQLite database path at runtime."""
+def _db_path() -> Path | str:
+    """Resolve the SQLite database path (or ``file:`` URI) at runtime."""
     return _db_module.DB_PATH
 
 
+@asynccontextmanager
+async def _connect() -> AsyncIterator[aiosqlite.Connection]:
+    """Open a per-call connection (rows as ``aiosqlite.Row``), always closed on exit."""
+    async with _db_module.connect_db(_db_path()) as db:
+        db.row_factory = aiosqlite.Row
+        yield db
+
+
 # =============================================================================
 # LOOP 1 TOOLS — Campaign Performance → Prompt Weight Updates
 # =============================================================================
@@ -100,9 +109,13 @@ def get_campaign_performance(company_id: str) -> str:
           - clicks (int)
           - confidence_score (float): Agent 3's original confidence
     """
+    return json.dumps(get_campaign_performance_obj(company_id))
+
+
+def get_campaign_performance_obj(company_id: str) -> dict:
+    """Dict-returning core of get_campaign_performance (no JSON round trip)."""
     async def _query() -> List[dict]:
-        async with aiosqlite.connect(_db_path()) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect() as db:
             cursor = await db.execute(
                 """
                 SELECT
@@ -127,7 +140,7 @@ def get_campaign_performance(company_id: str) -> str:
 
     rows = _run_async_safe(_query())
 
-    return json.dumps({"company_id": company_id, "campaigns": rows, "count": len(rows)})
+    return {"company_id": company_id, "campaigns": rows, "count": len(rows)}
 
 
 def compute_prompt_weights(performance_json: str, company_id: str) -> str:
@@ -151,16 +164,19 @@ def compute_prompt_weights(performance_json: str, company_id: str) -> str:
     except (json.JSONDecodeError, TypeError):
         return json.dumps({"error": "Invalid performance_json", "weight_updates": []})
 
-    campaigns = data.get("campaigns", [])
+    return json.dumps(compute_prompt_weights_obj(data, company_id))
+
+
+def compute_prompt_weights_obj(performance: dict, company_id: str) -> dict:
+    """Dict-in/dict-out core of compute_prompt_weights."""
+    campaigns = performance.get("campaigns", [])
     if not campaigns:
-        return json.dumps(
-            {
-                "company_id": company_id,
-                "campaigns_analyzed": 0,
-                "weight_updates": [],
-                "message": "No campaigns found — weights unchanged.",
-            }
-        )
+        return {
+            "company_id": company_id,
+            "campaigns_analyzed": 0,
+            "weight_updates": [],
+            "message": "No campaigns found — weights unchanged.",
+        }
 
     # ── Aggregate by channel ─────────────────────────────────────────────────
     channel_eng: Dict[str, List[float]] = {}
@@ -247,13 +263,21 @@ def compute_prompt_weights(performance_json: str, company_id: str) -> str:
             }
         )
 
-    return json.dumps(
-        {
-            "company_id": company_id,
-            "campaigns_analyzed": len(campaigns),
-            "weight_updates": weight_updates,
-        }
-    )
+    return {
+        "company_id": company_id,
+        "campaigns_analyzed": len(campaigns),
+        "weight_updates": weight_updates,
+    }
+
+
+_UPSERT_PROMPT_WEIGHT_SQL = """
+    INSERT INTO prompt_weights (id, company_id, agent_name, weight_key,
+                                weight_value, updated_at)
+    VALUES (?, ?, 'campaign_gen', ?, ?, ?)
+    ON CONFLICT(company_id, agent_name, weight_key)
+    DO UPDATE SET weight_value = excluded.weight_value,
+                  updated_at   = excluded.updated_at
+"""
 
 
 def save_prompt_weights(weights_json: str) -> str:
@@ -277,41 +301,34 @@ def save_prompt_weights(weights_json: str) -> str:
     except (json.JSONDecodeError, TypeError):
         return json.dumps({"error": "Invalid weights_json", "saved": 0, "success": False})
 
-    company_id = data.get("company_id", "")
-    updates = data.get("weight_updates", [])
+    return json.dumps(save_prompt_weights_obj(data))
+
+
+def save_prompt_weights_obj(weights: dict) -> dict:
+    """Dict-in/dict-out core of save_prompt_weights."""
+    company_id = weights.get("company_id", "")
+    updates = weights.get("weight_updates", [])
 
     if not company_id or not updates:
-        return json.dumps({"saved": 0, "company_id": company_id, "success": True,
-                           "message": "Nothing to save."})
+        return {"saved": 0, "company_id": company_id, "success": True,
+                "message": "Nothing to save."}
+
+    now = datetime.now(UTC).isoformat()
+    rows = [
+        (str(uuid.uuid4()), company_id, upd["weight_key"], float(upd.get("weight_value", 1.0)), now)
+        for upd in updates
+    ]
 
     async def _save() -> int:
-        async with aiosqlite.connect(_db_path()) as db:
-            count = 0
-            for upd in updates:
-                await db.execute(
-                    """
-                    INSERT INTO prompt_weights (id, company_id, agent_name, weight_key,
-                                                weight_value, updated_at)
-                    VALUES (?, ?, 'campaign_gen', ?, ?, ?)
-                    ON CONFLICT(company_id, agent_name, weight_key)
-                    DO UPDATE SET weight_value = excluded.weight_value,
-                                  updated_at   = excluded.updated_at
-                    """,
-                    (
-                        str(uuid.uuid4()),
-                        company_id,
-                        upd["weight_key"],
-                        float(upd.get("weight_value", 1.0)),
-                        datetime.now(UTC).isoformat(),
-                    ),
-                )
-                count += 1
+        async with _connect() as db:
+            await db.execute("BEGIN")
+            await db.executemany(_UPSERT_PROMPT_WEIGHT_SQL, rows)
             await db.commit()
-            return count
+        return len(rows)
 
     saved = _run_async_safe(_save())
 
-    return json.dumps({"saved": saved, "company_id": company_id, "success": True})
+    return {"saved": saved, "company_id": company_id, "success": True}
 
 
 # =============================================================================
@@ -332,9 +349,7 @@ def get_cross_company_metrics(min_campaigns: int = 3) -> str:
           - total_campaigns (int)
     """
     async def _query() -> dict:
-        async with aiosqlite.connect(_db_path()) as db:
-            db.row_factory = aiosqlite.Row
-
+        async with _connect() as db:
             cursor = await db.execute(
                 """
                 SELECT
@@ -471,7 +486,7 @@ def save_shared_pattern(pattern_json: str) -> str:
     now = datetime.now(UTC).isoformat()
 
     async def _save() -> None:
-        async with aiosqlite.connect(_db_path()) as db:
+        async with _connect() as db:
             await db.execute(
                 """
                 INSERT INTO shared_patterns
@@ -516,8 +531,7 @@ def get_signal_engagement_pairs(limit: int = 100) -> str:
           - count (int)
     """
     async def _query() -> List[dict]:
-        async with aiosqlite.connect(_db_path()) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect() as db:
             cursor = await db.execute(
                 """
                 SELECT
@@ -624,6 +638,16 @@ def compute_calibration(pairs_json: str) -> str:
     return json.dumps({"calibrations": calibrations})
 
 
+_INSERT_CALIBRATION_SQL = """
+    INSERT INTO signal_calibration
+        (id, signal_category, probability_threshold,
+         volume_velocity_threshold, predicted_engagement,
+         actual_engagement, accuracy_score, company_type,
+         calibrated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def save_calibration(calibrations_json: str) -> str:
     """Persist signal calibration results to the signal_calibration table.
 
@@ -644,35 +668,27 @@ def save_calibration(calibrations_json: str) -> str:
         return json.dumps({"saved": 0, "success": True, "message": "Nothing to save."})
 
     now = datetime.now(UTC).isoformat()
+    rows = [
+        (
+            str(uuid.uuid4()),
+            cal.get("signal_category", "unknown"),
+            float(cal.get("probability_threshold", 0.5)),
+            float(cal.get("volume_velocity_threshold", 0.0)),
+            float(cal.get("predicted_engagement", 0.0)),
+            float(cal.get("actual_engagement", 0.0)),
+            float(cal.get("accuracy_score", 0.5)),
+            cal.get("company_type", "unknown"),
+            now,
+        )
+        for cal in calibrations
+    ]
 
     async def _save() -> int:
-        async with aiosqlite.connect(_db_path()) as db:
-            count = 0
-            for cal in calibrations:
-                await db.execute(
-                    """
-                    INSERT INTO signal_calibration
-                        (id, signal_category, probability_threshold,
-                         volume_velocity_threshold, predicted_engagement,
-                         actual_engagement, accuracy_score, company_type,
-                         calibrated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        str(uuid.uuid4()),
-                        cal.get("signal_category", "unknown"),
-                        float(cal.get("probability_threshold", 0.5)),
-                        float(cal.get("volume_velocity_threshold", 0.0)),
-                        float(cal.get("predicted_engagement", 0.0)),
-                        float(cal.get("actual_engagement", 0.0)),
-                        float(cal.get("accuracy_score", 0.5)),
-                        cal.get("company_type", "unknown"),
-                        now,
-                    ),
-                )
-                count += 1
+        async with _connect() as db:
+            await db.execute("BEGIN")
+            await db.executemany(_INSERT_CALIBRATION_SQL, rows)
             await db.commit()
-            return count
+        return len(rows)
 
     saved = _run_async_safe(_save())
 
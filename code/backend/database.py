@@ -9,9 +9,21 @@ import aiosqlite
 from pathlib import Path
 
 DB_PATH = Path(os.getenv("DATABASE_PATH", str(Path(__file__).parent / "data" / "onlygen.db")))
+# Shared-cache in-memory database; lives as long as one connection stays open.
+MEMORY_DB_URI = "file:signal_mem?mode=memory&cache=shared"
 _INIT_LOCK = asyncio.Lock()
 _INITIALIZED_DBS: set[Path] = set()
 
+
+def _is_uri(db_path: Path | str) -> bool:
+    return isinstance(db_path, str) and db_path.startswith("file:")
+
+
+def connect_db(db_path: Path | str = DB_PATH) -> aiosqlite.Connection:
+    """Open an aiosqlite connection to a file path or a ``file:`` URI."""
+    return aiosqlite.connect(db_path, uri=_is_uri(db_path))
+
+
 CREATE_TABLES_SQL = """
 PRAGMA journal_mode=WAL;
 
@@ -166,40 +178,65 @@ ON campaigns(company_id, status, created_at DESC);
 
 CREATE INDEX IF NOT EXISTS idx_campaign_metrics_campaign_measured
 ON campaign_metrics(campaign_id, measured_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_campaigns_company_created
+ON campaigns(company_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_signal_calibration_category_calibrated
+ON signal_calibration(signal_category, calibrated_at DESC);
 """
 
 
-async def init_db(db_path: Path = DB_PATH) -> None:
-    """Create schema once per DB path and run lightweight migrations."""
-    resolved_path = db_path.resolve()
-    if resolved_path in _INITIALIZED_DBS:
-        return
-    async with _INIT_LOCK:
+# Columns added after the original schema: (table, column, type)
+_MIGRATIONS = (
+    ("companies", "website", "TEXT"),
+    ("trend_signals", "confidence_score", "REAL"),
+)
+
+_MIGRATION_COLUMNS_SQL = """
+    SELECT m.name, p.name
+    FROM sqlite_master AS m, pragma_table_info(m.name) AS p
+    WHERE m.type = 'table'
+"""
+
+
+async def init_db(db_path: Path | str = DB_PATH) -> None:
+    """Create schema once per DB path and run lightweight migrations.
+
+    ``db_path`` may also be a ``file:`` URI (e.g. MEMORY_DB_URI). URIs are not
+    cached as initialised since in-memory databases vanish with their last
+    connection.
+    """
+    if not _is_uri(db_path):
+        resolved_path = db_path.resolve()
         if resolved_path in _INITIALIZED_DBS:
             return
+        async with _INIT_LOCK:
+            if resolved_path in _INITIALIZED_DBS:
+                return
 
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    async with aiosqlite.connect(db_path) as db:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    async with connect_db(db_path) as db:
         await db.executescript(CREATE_TABLES_SQL)
-        # Migration: add website column if missing (existing DBs)
-        cursor = await db.execute("PRAGMA table_info(companies)")
-        rows = await cursor.fetchall()
-        has_website = any(r[1] == "website" for r in rows)
-        if not has_website:
-            await db.execute("ALTER TABLE companies ADD COLUMN website TEXT")
-        cursor = await db.execute("PRAGMA table_info(trend_signals)")
-        signal_rows = await cursor.fetchall()
-        signal_cols = {r[1] for r in signal_rows}
-        if "confidence_score" not in signal_cols:
-            await db.execute("ALTER TABLE trend_signals ADD COLUMN confidence_score REAL")
+        # Migrations for existing DBs: one column lookup, then only the ALTERs needed
+        cursor = await db.execute(_MIGRATION_COLUMNS_SQL)
+        existing = set(await cursor.fetchall())
+        alters = [
+            f"ALTER TABLE {table} ADD COLUMN {column} {col_type};"
+            for table, column, col_type in _MIGRATIONS
+            if (table, column) not in existing
+        ]
+        if alters:
+            await db.executescript("\n".join(alters))
         await db.commit()
-    _INITIALIZED_DBS.add(resolved_path)
+    if not _is_uri(db_path):
+        _INITIALIZED_DBS.add(resolved_path)
 
 
-async def get_company_by_id(company_id: str, db_path: Path = DB_PATH) -> dict | None:
+async def get_company_by_id(company_id: str, db_path: Path | str = DB_PATH) -> dict | None:
     """Load a single company row by id. Returns dict suitable for CompanyProfile.from_db_row, or None."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             "SELECT * FROM companies WHERE id = ?", (company_id,)
@@ -208,10 +245,10 @@ async def get_company_by_id(company_id: str, db_path: Path = DB_PATH) -> dict |
     return dict(row) if row else None
 
 
-async def get_latest_company_row(db_path: Path = DB_PATH) -> dict | None:
+async def get_latest_company_row(db_path: Path | str = DB_PATH) -> dict | None:
     """Load the most recently updated company row. Returns dict suitable for CompanyProfile.from_db_row, or None."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             "SELECT * FROM companies ORDER BY updated_at DESC LIMIT 1"
@@ -220,10 +257,11 @@ async def get_latest_company_row(db_path: Path = DB_PATH) -> dict | None:
     return dict(row) if row else None
 
 
-async def get_db(db_path: Path = DB_PATH):
+async def get_db(db_path: Path | str = DB_PATH):
     """Async context manager for database connections."""
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    async with aiosqlite.connect(db_path) as db:
+    if not _is_uri(db_path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    async with connect_db(db_path) as db:
         db.row_factory = aiosqlite.Row
         yield db
 
@@ -232,9 +270,9 @@ async def get_db(db_path: Path = DB_PATH):
 # Company helpers
 # ---------------------------------------------------------------------------
 
-async def list_companies(db_path: Path = DB_PATH) -> list[dict]:
+async def list_companies(db_path: Path | str = DB_PATH) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute("SELECT * FROM companies ORDER BY updated_at DESC")
         rows = await cursor.fetchall()
@@ -246,13 +284,13 @@ async def list_companies(db_path: Path = DB_PATH) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 async def list_signals(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     company_id: str | None = None,
     category: str | None = None,
     limit: int = 50,
 ) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses, params = [], []
         if category:
@@ -283,19 +321,19 @@ async def list_signals(
     return filtered
 
 
-async def get_signal_by_id(signal_id: str, db_path: Path = DB_PATH) -> dict | None:
+async def get_signal_by_id(signal_id: str, db_path: Path | str = DB_PATH) -> dict | None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute("SELECT * FROM trend_signals WHERE id = ?", (signal_id,))
         row = await cursor.fetchone()
     return dict(row) if row else None
 
 
-async def insert_signal(row: dict, db_path: Path = DB_PATH) -> None:
+async def insert_signal(row: dict, db_path: Path | str = DB_PATH) -> None:
     """Insert or replace a signal row into trend_signals."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         await conn.execute(
             """
             INSERT OR REPLACE INTO trend_signals
@@ -320,13 +358,13 @@ async def insert_signal(row: dict, db_path: Path = DB_PATH) -> None:
 # ---------------------------------------------------------------------------
 
 async def list_campaigns(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     company_id: str | None = None,
     status: str | None = None,
     limit: int = 50,
 ) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses, params = [], []
         if company_id:
@@ -345,12 +383,12 @@ async def list_campaigns(
 
 
 async def count_campaigns(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     company_id: str | None = None,
 ) -> int:
     """Return total campaign count, optionally scoped to a company."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         if company_id:
             cursor = await conn.execute(
                 "SELECT COUNT(*) AS cnt FROM campaigns WHERE company_id = ?",
@@ -362,9 +400,9 @@ async def count_campaigns(
     return int(row[0] if row else 0)
 
 
-async def get_campaign_by_id(campaign_id: str, db_path: Path = DB_PATH) -> dict | None:
+async def get_campaign_by_id(campaign_id: str, db_path: Path | str = DB_PATH) -> dict | None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
         row = await cursor.fetchone()
@@ -372,10 +410,10 @@ async def get_campaign_by_id(campaign_id: str, db_path: Path = DB_PATH) -> dict
 
 
 async def update_campaign_status(
-    campaign_id: str, new_status: str, db_path: Path = DB_PATH
+    campaign_id: str, new_status: str, db_path: Path | str = DB_PATH
 ) -> None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         await conn.execute(
             "UPDATE campaigns SET status = ? WHERE id = ?", (new_status, campaign_id)
         )
@@ -386,11 +424,11 @@ async def update_campaign_distribution(
     campaign_id: str,
     channel_recommendation: str,
     channel_reasoning: str | None = None,
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
 ) -> None:
     """Persist Agent 4 routing fields for a campaign."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         if channel_reasoning is None:
             await conn.execute(
                 """
@@ -412,9 +450,9 @@ async def update_campaign_distribution(
         await conn.commit()
 
 
-async def insert_campaign_metrics(row: dict, db_path: Path = DB_PATH) -> None:
+async def insert_campaign_metrics(row: dict, db_path: Path | str = DB_PATH) -> None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         await conn.execute(
             """
             INSERT OR REPLACE INTO campaign_metrics
@@ -430,10 +468,10 @@ async def insert_campaign_metrics(row: dict, db_path: Path = DB_PATH) -> None:
 
 
 async def get_campaign_metrics(
-    campaign_id: str, db_path: Path = DB_PATH
+    campaign_id: str, db_path: Path | str = DB_PATH
 ) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             "SELECT * FROM campaign_metrics WHERE campaign_id = ? ORDER BY measured_at DESC",
@@ -447,10 +485,10 @@ async def get_campaign_metrics(
 # Agent trace helpers
 # ---------------------------------------------------------------------------
 
-async def insert_agent_trace(row: dict, db_path: Path = DB_PATH) -> None:
+async def insert_agent_trace(row: dict, db_path: Path | str = DB_PATH) -> None:
     """Insert one agent run trace row into agent_traces."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         await conn.execute(
             """
             INSERT OR REPLACE INTO agent_traces
@@ -468,7 +506,7 @@ async def insert_agent_trace(row: dict, db_path: Path = DB_PATH) -> None:
 
 
 async def list_agent_traces(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     agent_name: str | None = None,
     company_id: str | None = None,
     campaign_id: str | None = None,
@@ -479,7 +517,7 @@ async def list_agent_traces(
     campaign_id is matched against output_summary text, where campaign ids are embedded.
     """
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses, params = [], []
         if agent_name:
@@ -507,11 +545,11 @@ async def list_agent_traces(
 async def get_prompt_weights(
     company_id: str,
     agent_name: str = "campaign_gen",
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
 ) -> dict[str, float]:
     """Return prompt weights for a company/agent keyed by weight_key."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             """
@@ -527,7 +565,7 @@ async def get_prompt_weights(
 
 
 async def get_shared_patterns(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     pattern_type: str | None = None,
     min_confidence: float = 0.0,
     industry: str | None = None,
@@ -535,7 +573,7 @@ async def get_shared_patterns(
 ) -> list[dict]:
     """Return shared patterns with optional type/industry filtering."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses = ["confidence >= ?"]
         params: list = [min_confidence]
@@ -585,7 +623,7 @@ async def get_shared_patterns(
 
 
 async def get_signal_calibration(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     company_type: str | None = None,
     signal_category: str | None = None,
     min_accuracy: float = 0.0,
@@ -593,7 +631,7 @@ async def get_signal_calibration(
 ) -> list[dict]:
     """Return signal calibration rows, newest first, with optional filters."""
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses = ["accuracy_score >= ?"]
         params: list = [min_accuracy]
@@ -623,12 +661,12 @@ async def get_signal_calibration(
 # ---------------------------------------------------------------------------
 
 async def list_content_strategies(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     campaign_id: str | None = None,
     company_id: str | None = None,
 ) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses, params = [], []
         if campaign_id:
@@ -647,10 +685,10 @@ async def list_content_strategies(
 
 
 async def get_content_strategy_by_id(
-    strategy_id: str, db_path: Path = DB_PATH
+    strategy_id: str, db_path: Path | str = DB_PATH
 ) -> dict | None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             "SELECT * FROM content_strategies WHERE id = ?", (strategy_id,)
@@ -664,13 +702,13 @@ async def get_content_strategy_by_id(
 # ---------------------------------------------------------------------------
 
 async def list_content_pieces(
-    db_path: Path = DB_PATH,
+    db_path: Path | str = DB_PATH,
     strategy_id: str | None = None,
     campaign_id: str | None = None,
     company_id: str | None = None,
 ) -> list[dict]:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         clauses, params = [], []
         if strategy_id:
@@ -692,10 +730,10 @@ async def list_content_pieces(
 
 
 async def get_content_piece_by_id(
-    piece_id: str, db_path: Path = DB_PATH
+    piece_id: str, db_path: Path | str = DB_PATH
 ) -> dict | None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         conn.row_factory = aiosqlite.Row
         cursor = await conn.execute(
             "SELECT * FROM content_pieces WHERE id = ?", (piece_id,)
@@ -705,10 +743,10 @@ async def get_content_piece_by_id(
 
 
 async def update_content_piece_status(
-    piece_id: str, new_status: str, db_path: Path = DB_PATH
+    piece_id: str, new_status: str, db_path: Path | str = DB_PATH
 ) -> None:
     await init_db(db_path)
-    async with aiosqlite.connect(db_path) as conn:
+    async with connect_db(db_path) as conn:
         await conn.execute(
             "UPDATE content_pieces SET status = ? WHERE id = ?", (new_status, piece_id)
         )
@@ -21,14 +21,20 @@ API : https://api.airia.ai/docs
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import shelve
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Walk up from this file to find .env at any ancestor directory
 _here = Path(__file__).resolve()
@@ -45,6 +51,47 @@ logger = logging.getLogger(__name__)
 # Airia API constants
 AIRIA_BASE_URL = "https://api.airia.ai"
 AIRIA_PIPELINE_EXEC_PATH = "/v2/PipelineExecution"
+# Pooled keep-alive connections per client; sized for a handful of concurrent calls
+AIRIA_POOL_SIZE = 10
+
+
+# Opt-in exact-match response cache (AIRIA_TEST_CACHE=1) for repeated test inputs
+AIRIA_CACHE_DIR = Path.home() / ".cache" / "airia"
+_CACHE_LOCK = threading.Lock()  # shelve is not safe for concurrent access
+
+
+def _cached_call(
+    pipeline_id: str, body: dict[str, Any] | bytes, call: Callable[[], dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Return call()'s result, cached on disk under a hash of pipeline_id and the request body.
+
+    The body (a payload dict or pre-serialised JSON bytes) is keyed in canonical form,
+    so run_pipeline and run_pipeline_raw share entries for the same request. A hit
+    reports latency_ms=0 since no API call was made.
+
+    Only active when AIRIA_TEST_CACHE=1, so live-regression runs always hit the API.
+    """
+    if os.getenv("AIRIA_TEST_CACHE") != "1":
+        return call()
+
+    payload = json.loads(body) if isinstance(body, bytes) else body
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    key = hashlib.sha256(f"{pipeline_id}|{canonical}".encode()).hexdigest()
+    cache_path = str(AIRIA_CACHE_DIR / "responses")
+    with _CACHE_LOCK:
+        AIRIA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with shelve.open(cache_path) as cache:
+            hit = cache.get(key)
+    if hit is not None:
+        logger.info("airia_pipeline_cache_hit", extra={"pipeline_id": pipeline_id})
+        return {**hit, "latency_ms": 0}
+
+    result = call()
+    with _CACHE_LOCK:
+        with shelve.open(cache_path) as cache:
+            cache[key] = result
+    return result
 
 
 class AiriaError(Exception):
@@ -86,6 +133,17 @@ class AiriaClient:
                 "Get a key at: https://airia.com → Settings → API Keys"
             )
 
+        # One pooled session per client so repeated calls reuse the TCP/TLS connection
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=AIRIA_POOL_SIZE, pool_maxsize=AIRIA_POOL_SIZE),
+        )
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self._session.close()
+
     @property
     def _headers(self) -> dict[str, str]:
         return {
@@ -110,6 +168,9 @@ class AiriaClient:
                             True  = fire-and-forget (returns immediately, poll separately).
             extra_fields  : Optional additional body fields (e.g. {"conversationId": "..."}).
 
+        With AIRIA_TEST_CACHE=1, repeat synchronous calls with the same pipeline_id and
+        user_input are served from the on-disk cache in ~/.cache/airia (latency_ms=0).
+
         Returns:
             dict with at minimum:
                 - pipelineOutput (str): The pipeline's text response
@@ -118,7 +179,6 @@ class AiriaClient:
         Raises:
             AiriaError: On HTTP errors or unexpected responses.
         """
-        url = f"{self.base_url}{AIRIA_PIPELINE_EXEC_PATH}/{pipeline_id}"
         payload: dict[str, Any] = {
             "userInput": user_input,
             "asyncOutput": async_output,
@@ -130,14 +190,40 @@ class AiriaClient:
             "airia_pipeline_call_start",
             extra={"pipeline_id": pipeline_id, "input_len": len(user_input)},
         )
+        if async_output or extra_fields:
+            return self._post_pipeline(pipeline_id, json=payload)
+        return _cached_call(
+            pipeline_id, payload, lambda: self._post_pipeline(pipeline_id, json=payload)
+        )
+
+    def run_pipeline_raw(self, pipeline_id: str, body: bytes) -> dict[str, Any]:
+        """
+        Execute a pipeline with a pre-serialised JSON request body.
+
+        For callers that send the same input repeatedly: build the body once, e.g.
+        json.dumps({"userInput": ..., "asyncOutput": False}).encode(), and skip the
+        per-call encoding. Errors, the returned dict and the AIRIA_TEST_CACHE
+        response cache behave as for run_pipeline.
+        """
+        logger.info(
+            "airia_pipeline_call_start",
+            extra={"pipeline_id": pipeline_id, "input_len": len(body)},
+        )
+        return _cached_call(
+            pipeline_id, body, lambda: self._post_pipeline(pipeline_id, data=body)
+        )
+
+    def _post_pipeline(self, pipeline_id: str, **body: Any) -> dict[str, Any]:
+        """POST one execution request (``json=`` payload or ``data=`` bytes) and check the response."""
+        url = f"{self.base_url}{AIRIA_PIPELINE_EXEC_PATH}/{pipeline_id}"
         start = time.perf_counter()
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
-                json=payload,
                 headers=self._headers,
                 timeout=self.timeout,
+                **body,
             )
             latency_ms = int((time.perf_counter() - start) * 1000)
 
@@ -176,6 +262,44 @@ class AiriaClient:
                 f"Airia API timed out after {self.timeout}s for pipeline '{pipeline_id}'."
             )
 
+    def run_pipelines_batch(
+        self,
+        calls: list[tuple[str, str | bytes]],
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Execute several synchronous pipeline calls at once.
+
+        Airia exposes no bulk-execution endpoint, so the calls are fanned out over
+        this client's pooled session (at most AIRIA_POOL_SIZE in flight) rather than
+        made one after another.
+
+        Args:
+            calls             : (pipeline_id, user_input) pairs; a bytes user_input is
+                                taken as a pre-serialised body (see run_pipeline_raw).
+            return_exceptions : If True, a failed call's exception is returned in its
+                                slot instead of raised (like asyncio.gather).
+
+        Returns:
+            One run_pipeline result per call, in input order.
+        """
+        if not calls:
+            return []
+
+        def _run(call: tuple[str, str | bytes]) -> Any:
+            pipeline_id, user_input = call
+            try:
+                if isinstance(user_input, bytes):
+                    return self.run_pipeline_raw(pipeline_id, user_input)
+                return self.run_pipeline(pipeline_id, user_input)
+            except Exception as exc:
+                if return_exceptions:
+                    return exc
+                raise
+
+        with ThreadPoolExecutor(max_workers=min(len(calls), AIRIA_POOL_SIZE)) as pool:
+            return list(pool.map(_run, calls))
+
     def test_connectivity(self) -> dict[str, Any]:
         """
         Test that the API key is valid and the Airia API is reachable.
@@ -194,7 +318,7 @@ class AiriaClient:
         start = time.perf_counter()
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json={"userInput": "ping", "asyncOutput": False},
                 headers=self._headers,
@@ -266,8 +390,8 @@ class AiriaGateway:
         "content_production":          "AIRIA_PIPELINE_CONTENT_PRODUCTION",
     }
 
-    def __init__(self) -> None:
-        self.client = AiriaClient()
+    def __init__(self, client: Optional[AiriaClient] = None) -> None:
+        self.client = client or AiriaClient()
 
     def get_pipeline_id(self, agent_name: str) -> Optional[str]:
         """Return the Airia pipeline GUID for the given onlyGen agent, or None if not set."""
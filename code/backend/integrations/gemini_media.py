@@ -20,7 +20,7 @@ import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import structlog
 
@@ -38,6 +38,23 @@ class MediaAsset:
     model: str
 
 
+_default_client: Optional[Any] = None
+
+
+def _get_client() -> Any:
+    """Return the shared google-genai client (lazy-init).
+
+    Building a client sets up auth and an HTTP connection pool, so reuse one
+    across image/video calls instead of paying that cost per asset.
+    """
+    global _default_client
+    if _default_client is None:
+        from google import genai
+
+        _default_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    return _default_client
+
+
 def _media_dir() -> Path:
     base = Path(os.getenv("MEDIA_OUTPUT_DIR", "./data/generated_media"))
     base.mkdir(parents=True, exist_ok=True)
@@ -95,10 +112,9 @@ async def generate_image_asset(
 
     started = time.perf_counter()
     try:
-        from google import genai
         from google.genai import types as genai_types
 
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        client = _get_client()
         full_prompt = prompt if not style_hint else f"{prompt}\nStyle: {style_hint}"
 
         response = client.models.generate_content(
@@ -182,10 +198,9 @@ async def generate_video_asset(
 
     started = time.perf_counter()
     try:
-        from google import genai
         from google.genai import types as genai_types
 
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        client = _get_client()
 
         full_prompt = prompt + (f"\nStyle: {style_hint}" if style_hint else "")
 
@@ -0,0 +1,27 @@
+"""
+onlyGen — JSON helpers
+Shared (de)serialisation for agent tool boundaries: orjson when installed,
+stdlib json otherwise. The two paths return equivalent JSON that ``loads``
+can read, not identical text (separators, indentation, datetimes, non-str
+keys and NaN are handled differently).
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to stdlib json
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialise to a JSON string (non-JSON values such as datetimes via ``str``)."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
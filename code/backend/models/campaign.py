@@ -69,21 +69,27 @@ class CampaignConcept(BaseModel):
 
     @classmethod
     def from_db_row(cls, row: dict) -> "CampaignConcept":
-        """Reconstruct from a SQLite row dict."""
-        return cls(
+        """Reconstruct from a SQLite row dict.
+
+        Rows were validated on the way in, so this skips pydantic validation via
+        ``model_construct`` and only coerces the column types SQLite can't carry
+        (enum, bool, datetime). A corrupt row therefore loads without raising.
+        The content models' ``from_db_row`` work the same way.
+        """
+        return cls.model_construct(
             id=row["id"],
             company_id=row.get("company_id"),
             trend_signal_id=row.get("trend_signal_id"),
             headline=row["headline"],
             body_copy=row["body_copy"],
-            visual_direction=row.get("visual_direction", ""),
+            visual_direction=row.get("visual_direction") or "",
             visual_asset_url=row.get("visual_asset_url"),
             confidence_score=float(row.get("confidence_score") or 0.0),
-            channel_recommendation=Channel(row.get("channel_recommendation", "twitter")),
-            channel_reasoning=row.get("channel_reasoning", ""),
+            channel_recommendation=Channel(row.get("channel_recommendation") or "twitter"),
+            channel_reasoning=row.get("channel_reasoning") or "",
             safety_score=row.get("safety_score"),
             safety_passed=bool(row.get("safety_passed", 1)),
-            status=row.get("status", "draft"),
+            status=row.get("status") or "draft",
             created_at=datetime.fromisoformat(row["created_at"]) if row.get("created_at") else _utcnow(),
         )
 
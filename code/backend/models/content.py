@@ -10,7 +10,7 @@ from datetime import UTC, datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 def _utcnow() -> datetime:
@@ -76,7 +76,14 @@ CONTENT_TYPE_META: Dict[str, Dict[str, Any]] = {
 
 
 class ContentStrategy(BaseModel):
-    """Output of Agent 6 — a recommended content format for a campaign concept."""
+    """Output of Agent 6 — a recommended content format for a campaign concept.
+
+    Frozen so the validated plan handed to Agent 7 cannot be changed afterwards;
+    assigning a field raises ``ValidationError``. ContentPiece stays mutable
+    because Agent 7 attaches media assets to pieces after generation.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     campaign_id: str = Field(..., description="CampaignConcept this strategy is for")
@@ -123,25 +130,22 @@ class ContentStrategy(BaseModel):
 
     @classmethod
     def from_db_row(cls, row: dict) -> "ContentStrategy":
-        outline = row.get("structure_outline", "[]")
+        """Reconstruct from a SQLite row dict (no re-validation, see CampaignConcept)."""
+        outline = row.get("structure_outline") or "[]"
         if isinstance(outline, str):
             outline = json.loads(outline)
-        return cls(
+        return cls.model_construct(
             id=row["id"],
             campaign_id=row["campaign_id"],
             company_id=row["company_id"],
             content_type=ContentType(row["content_type"]),
-            reasoning=row.get("reasoning", ""),
-            target_length=row.get("target_length", ""),
-            tone_direction=row.get("tone_direction", ""),
+            reasoning=row.get("reasoning") or "",
+            target_length=row.get("target_length") or "",
+            tone_direction=row.get("tone_direction") or "",
             structure_outline=outline,
             priority_score=float(row.get("priority_score", 0.5)),
             visual_needed=bool(row.get("visual_needed", 0)),
-            created_at=(
-                datetime.fromisoformat(row["created_at"])
-                if row.get("created_at")
-                else _utcnow()
-            ),
+            created_at=datetime.fromisoformat(row["created_at"]) if row.get("created_at") else _utcnow(),
         )
 
     def to_dict(self) -> dict:
@@ -204,7 +208,8 @@ class ContentPiece(BaseModel):
 
     @classmethod
     def from_db_row(cls, row: dict) -> "ContentPiece":
-        return cls(
+        """Reconstruct from a SQLite row dict (no re-validation, see CampaignConcept)."""
+        return cls.model_construct(
             id=row["id"],
             strategy_id=row["strategy_id"],
             campaign_id=row["campaign_id"],
@@ -212,18 +217,14 @@ class ContentPiece(BaseModel):
             content_type=ContentType(row["content_type"]),
             title=row["title"],
             body=row["body"],
-            summary=row.get("summary", ""),
-            word_count=int(row.get("word_count", 0)),
+            summary=row.get("summary") or "",
+            word_count=int(row.get("word_count") or 0),
             visual_prompt=row.get("visual_prompt"),
             visual_asset_url=row.get("visual_asset_url"),
-            quality_score=float(row.get("quality_score", 0)),
-            brand_alignment=float(row.get("brand_alignment", 0)),
-            status=row.get("status", "draft"),
-            created_at=(
-                datetime.fromisoformat(row["created_at"])
-                if row.get("created_at")
-                else _utcnow()
-            ),
+            quality_score=float(row.get("quality_score") or 0),
+            brand_alignment=float(row.get("brand_alignment") or 0),
+            status=row.get("status") or "draft",
+            created_at=datetime.fromisoformat(row["created_at"]) if row.get("created_at") else _utcnow(),
         )
 
     def to_dict(self) -> dict:
@@ -8,6 +8,14 @@ from huggingface_hub import InferenceClient
 
 DEFAULT_MODEL = "stabilityai/stable-diffusion-xl-base-1.0"
 
+# Encoder options per output format. PNG skips the extra `optimize` pass;
+# WEBP/JPEG are lossy but several times smaller and faster to encode.
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 90, "method": 4},
+    "jpg": {"format": "JPEG", "quality": 95},
+    "png": {"format": "PNG", "optimize": False},
+}
+
 POST_PROMPT = """
 Square Instagram post (1080x1080). Bright gradient background (yellow to purple), clean modern typography, fun and friendly.
 Headline: “BECOME A SMARTER ADULT (IT’S NOT TOO LATE)”.
@@ -36,6 +44,30 @@ def get_hf_token() -> str | None:
     return os.getenv("HF_API_KEY") or os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACEHUB_API_TOKEN")
 
 
+def resolve_format(out_path: Path, fmt: str | None) -> str:
+    """Pick the output format: `--format` if given, else the `--out` suffix, else webp.
+
+    Warns when an explicit `--format` contradicts a recognised `--out` suffix.
+    """
+    suffix = out_path.suffix.lower().lstrip(".")
+    suffix = "jpg" if suffix == "jpeg" else suffix
+    if fmt is None:
+        return suffix if suffix in SAVE_OPTIONS else "webp"
+    if suffix in SAVE_OPTIONS and suffix != fmt:
+        print(f"⚠️  --out ends in .{suffix} but --format is {fmt}; saving as .{fmt}")
+    return fmt
+
+
+def save_image(image, out_path: Path, fmt: str) -> Path:
+    """Save a PIL image using the encoder options for `fmt` (png | webp | jpg)."""
+    out_path = out_path.with_suffix(f".{fmt}")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "jpg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(out_path, **SAVE_OPTIONS[fmt])
+    return out_path
+
+
 def main():
     env_path = load_env_from_project_root()
     token = get_hf_token()
@@ -45,7 +77,13 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--prompt", type=str, default=None, help="Custom prompt (optional)")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL)
-    parser.add_argument("--out", type=str, default="generated_content/post.png")
+    parser.add_argument("--out", type=str, default="generated_content/post.webp")
+    parser.add_argument(
+        "--format",
+        choices=sorted(SAVE_OPTIONS),
+        default=None,
+        help="Output encoding (use png for lossless); defaults to the --out suffix, else webp",
+    )
     args = parser.parse_args()
 
     prompt = args.prompt or POST_PROMPT
@@ -53,9 +91,8 @@ def main():
     client = InferenceClient(api_key=token)
     image = client.text_to_image(prompt=prompt, model=args.model)
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    image.save(out_path)
+    out = Path(args.out)
+    out_path = save_image(image, out, resolve_format(out, args.format))
 
     print(f"✅ Saved: {out_path.resolve()}")
 
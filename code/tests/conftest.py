@@ -0,0 +1,179 @@
+"""
+Shared pytest fixtures for the agent test suites in code/tests/.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+from backend.database import _INITIALIZED_DBS, init_db
+
+
+def _load_env() -> None:
+    """Load the nearest .env walking up from code/tests/."""
+    for parent in Path(__file__).resolve().parents:
+        candidate = parent / ".env"
+        if candidate.exists():
+            load_dotenv(candidate)
+            break
+
+
+# Loaded at conftest import, before test modules are collected, so the key
+# checks below and any module-level guards see it.
+_load_env()
+_GEMINI_KEY = os.getenv("GEMINI_API_KEY", "")
+_GEMINI_OK = bool(_GEMINI_KEY) and _GEMINI_KEY != "your_gemini_api_key_here"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-e2e",
+        action="store_true",
+        default=False,
+        help="run e2e tests that call Gemini (skipped by default)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip @pytest.mark.requires_gemini tests without a usable GEMINI_API_KEY,
+    and @pytest.mark.e2e tests unless --run-e2e is given.
+    """
+    if not _GEMINI_OK:
+        skip_gemini = pytest.mark.skip(reason="GEMINI_API_KEY not configured")
+        for item in items:
+            if "requires_gemini" in item.keywords:
+                item.add_marker(skip_gemini)
+    if config.getoption("--run-e2e"):
+        return
+    skip_e2e = pytest.mark.skip(reason="e2e test — pass --run-e2e to run")
+    for item in items:
+        if "e2e" in item.keywords:
+            item.add_marker(skip_e2e)
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory) -> Path:
+    """A schema-initialised SQLite file built once per session.
+
+    Integration tests copy it with ``shutil.copyfile`` instead of running the
+    full ``init_db`` DDL for every fresh temp database.
+    """
+    path = tmp_path_factory.mktemp("tpl") / "signal.db"
+    asyncio.run(init_db(path))
+    return path
+
+
+@pytest.fixture
+def temp_db(tmp_path, template_db, monkeypatch) -> Path:
+    """Per-test SQLite file with the schema already in place.
+
+    ``backend.database.DB_PATH`` is pointed at it via ``monkeypatch`` so the
+    original path is restored even when the test fails. The copy is registered
+    as initialised, so the ``init_db`` calls inside the persist helpers skip the
+    DDL.
+    """
+    path = tmp_path / "signal.db"
+    shutil.copyfile(template_db, path)
+    monkeypatch.setattr("backend.database.DB_PATH", path)
+    _INITIALIZED_DBS.add(path.resolve())
+    yield path
+    _INITIALIZED_DBS.discard(path.resolve())
+
+
+@pytest.fixture(scope="session")
+def shared_memory_db(template_db):
+    """A shared-cache in-memory database kept alive for the whole session.
+
+    Yields ``(uri, keeper)``; the sqlite3 ``keeper`` connection is what keeps
+    the database alive between tests.
+    """
+    uri = f"file:signal_test_{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    try:
+        yield uri, keeper
+    finally:
+        keeper.close()
+
+
+@pytest.fixture
+def memory_db(shared_memory_db, template_db, monkeypatch) -> str:
+    """Per-test reset of the session in-memory database.
+
+    Persist helpers commit on their own connections, so a SAVEPOINT held here
+    could not roll their writes back. Each test instead starts from a fresh
+    page copy of the schema template (``sqlite3.Connection.backup``), which
+    also drops whatever the previous test wrote.
+    """
+    uri, keeper = shared_memory_db
+    template = sqlite3.connect(template_db)
+    try:
+        template.backup(keeper)
+    finally:
+        template.close()
+    monkeypatch.setattr("backend.database.DB_PATH", uri)
+    return uri
+
+
+@pytest.fixture
+def db_conn(memory_db, shared_memory_db) -> sqlite3.Connection:
+    """The session's open connection to ``memory_db``, for test assertions.
+
+    Reuses the connection that keeps the in-memory DB alive instead of opening
+    a new one per verification query.
+    """
+    return shared_memory_db[1]
+
+
+@pytest.fixture
+def gemini_replay(monkeypatch) -> list[str]:
+    """Replay canned Gemini replies instead of calling the API.
+
+    Returns a list; each model call pops the next string off it and yields it
+    as the model's text reply. The ADK runner, tool wiring and response parsing
+    all run for real — only the network call to Gemini is replaced.
+    """
+    from google.adk.models import Gemini
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types as genai_types
+
+    from backend.config import settings
+
+    replies: list[str] = []
+
+    async def _replay(self, llm_request, stream=False):
+        text = replies.pop(0)
+        yield LlmResponse(content=genai_types.Content(role="model", parts=[genai_types.Part(text=text)]))
+
+    monkeypatch.setattr(Gemini, "generate_content_async", _replay)
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "replay-key")
+    return replies
+
+
+@pytest.fixture(scope="session")
+def campaign_gen_agent():
+    """Agent 3 built once per session; runs copy it with their own instruction."""
+    from backend.agents.campaign_gen import _build_agent
+
+    return _build_agent()
+
+
+@pytest.fixture(scope="session")
+def content_strategy_agent():
+    """Agent 6 built once per session; runs copy it with their own instruction."""
+    from backend.agents.content_strategy import _build_agent
+
+    return _build_agent()
+
+
+@pytest.fixture(scope="session")
+def content_production_agent():
+    """Agent 7 built once per session; runs copy it with their own instruction."""
+    from backend.agents.content_production import _build_agent
+
+    return _build_agent()
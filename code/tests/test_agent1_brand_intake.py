@@ -12,15 +12,10 @@ Two test layers:
 
 import asyncio
 import json
-import sys
-from pathlib import Path
 
 import pytest
 import pytest_asyncio
 
-# Make backend importable
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.models.company import CompanyProfile, CompanyProfileInput
 from backend.agents.brand_intake import (
     validate_brand_profile,
@@ -14,33 +14,17 @@ Run integration tests (no API key needed):
     pytest tests/test_agent3_campaign_gen.py -v -m integration
 
 Run e2e (requires GEMINI_API_KEY in .env):
-    pytest tests/test_agent3_campaign_gen.py -v -m e2e
+    pytest tests/test_agent3_campaign_gen.py -v -m e2e --run-e2e
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
-import os
 import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from dotenv import load_dotenv
-
-# Make backend importable from code/ (for backend.xxx imports)
-# and code/backend/ (for bare imports used inside campaign_gen.py tools)
-_code_dir = Path(__file__).parent.parent
-_backend_dir = _code_dir / "backend"
-sys.path.insert(0, str(_code_dir))
-sys.path.insert(0, str(_backend_dir))
-
-# Load .env from the repo root
-_here = Path(__file__).resolve()
-for _parent in [_here.parent, *_here.parents]:
-    _candidate = _parent / ".env"
-    if _candidate.exists():
-        load_dotenv(_candidate)
-        break
+from pydantic import ValidationError
 
 from backend.models.company import CompanyProfile
 from backend.models.signal import TrendSignal
@@ -56,8 +40,10 @@ from backend.agents.campaign_gen import (
     _build_instruction,
     _extract_concepts_from_response,
     _persist_agent_traces,
+    _persist_all,
 )
 from backend.routers.campaigns import _load_feedback_prompt_weights
+from backend.jsonio import dumps
 from backend.config import settings
 
 
@@ -65,7 +51,7 @@ from backend.config import settings
 # Fixtures
 # ──────────────────────────────────────────────────────────────────────────────
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_company() -> CompanyProfile:
     return CompanyProfile(
         id="company-001",
@@ -83,7 +69,7 @@ def sample_company() -> CompanyProfile:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_signals(sample_company) -> list:
     return [
         TrendSignal(
@@ -113,10 +99,10 @@ def sample_signals(sample_company) -> list:
     ]
 
 
-def _make_concepts_json(n: int = 3) -> str:
-    """Build a fake LLM output with n campaign concepts."""
+def _make_concepts_json(n: int = 3) -> list[dict]:
+    """Build a fake LLM output with n campaign concepts (fresh list — safe to mutate)."""
     channels = ["twitter", "linkedin", "instagram", "newsletter"]
-    concepts = [
+    return [
         {
             "headline": f"Concept {i + 1}: AI Is Reshaping Developer Workflows",
             "body_copy": (
@@ -132,7 +118,12 @@ def _make_concepts_json(n: int = 3) -> str:
         }
         for i in range(n)
     ]
-    return json.dumps(concepts)
+
+
+@functools.lru_cache(maxsize=None)
+def _make_concepts_json_str(n: int = 3) -> str:
+    """JSON-encoded form of _make_concepts_json (cached — the str is immutable)."""
+    return dumps(_make_concepts_json(n))
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -167,17 +158,17 @@ class TestCampaignConceptModel:
                 channel_reasoning="n/a",
             )
 
-    def test_all_channels_accepted(self):
-        for ch in ["twitter", "linkedin", "instagram", "newsletter"]:
-            c = CampaignConcept(
-                headline=f"Headline for {ch}",
-                body_copy="Body text " * 8,
-                visual_direction="visual",
-                confidence_score=0.75,
-                channel_recommendation=ch,
-                channel_reasoning=f"Great for {ch}",
-            )
-            assert c.channel_recommendation == Channel(ch)
+    @pytest.mark.parametrize("ch", ["twitter", "linkedin", "instagram", "newsletter"])
+    def test_all_channels_accepted(self, ch):
+        c = CampaignConcept(
+            headline=f"Headline for {ch}",
+            body_copy="Body text " * 8,
+            visual_direction="visual",
+            confidence_score=0.75,
+            channel_recommendation=ch,
+            channel_reasoning=f"Great for {ch}",
+        )
+        assert c.channel_recommendation == Channel(ch)
 
     def test_to_db_row_serialises_channel_as_string(self):
         c = CampaignConcept(
@@ -210,6 +201,22 @@ class TestCampaignConceptModel:
         assert restored.channel_recommendation == Channel.NEWSLETTER
         assert abs(restored.confidence_score - 0.82) < 0.001
 
+    def test_from_db_row_skips_validation(self):
+        # Rows are trusted: an out-of-range DB value loads as-is instead of raising.
+        row = CampaignConcept(
+            headline="Stored",
+            body_copy="Stored body copy " * 5,
+            visual_direction="minimal",
+            confidence_score=0.5,
+            channel_recommendation=Channel.TWITTER,
+            channel_reasoning="n/a",
+        ).to_db_row()
+        row["confidence_score"] = 1.5
+        restored = CampaignConcept.from_db_row(row)
+        assert restored.confidence_score == 1.5
+        with pytest.raises(ValidationError):
+            CampaignConcept.model_validate(restored.model_dump())
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Unit Tests — validate_campaign_concept tool
@@ -251,6 +258,17 @@ class TestValidateCampaignConcept:
         assert result["is_valid"] is False
         assert any("body_copy" in issue for issue in result["issues"])
 
+    def test_padded_short_body_copy_fails(self):
+        """Extra spaces, tabs and blank lines must not count as words."""
+        result = json.loads(validate_campaign_concept(
+            headline="Valid Headline",
+            body_copy="  Too   short\t\tstill.\n\n\n" + " " * 40,
+            channel_recommendation="twitter",
+            confidence_score=0.8,
+        ))
+        assert result["is_valid"] is False
+        assert any("(3 words" in issue for issue in result["issues"])
+
     def test_invalid_channel_fails(self):
         result = json.loads(validate_campaign_concept(
             headline="Valid Headline",
@@ -287,7 +305,7 @@ class TestValidateCampaignConcept:
 @pytest.mark.unit
 class TestFormatCampaignConcepts:
     def test_valid_concepts_normalised(self):
-        raw = _make_concepts_json(3)
+        raw = _make_concepts_json_str(3)
         result = json.loads(format_campaign_concepts(raw, "co-001", "sig-001"))
         assert result["count"] == 3
         assert result["company_id"] == "co-001"
@@ -302,18 +320,18 @@ class TestFormatCampaignConcepts:
         assert result["count"] == 0
 
     def test_unknown_channel_normalised_to_twitter(self):
-        concepts = json.loads(_make_concepts_json(1))
+        concepts = _make_concepts_json(1)
         concepts[0]["channel_recommendation"] = "tiktok"
         result = json.loads(format_campaign_concepts(json.dumps(concepts), "co-001", "sig-001"))
         assert result["concepts"][0]["channel_recommendation"] == "twitter"
 
     def test_wrapped_dict_format_accepted(self):
-        payload = json.dumps({"concepts": json.loads(_make_concepts_json(2))})
+        payload = json.dumps({"concepts": _make_concepts_json(2)})
         result = json.loads(format_campaign_concepts(payload, "co-001", "sig-001"))
         assert result["count"] == 2
 
     def test_company_id_attached_to_concepts(self):
-        raw = _make_concepts_json(2)
+        raw = _make_concepts_json_str(2)
         result = json.loads(format_campaign_concepts(raw, "co-xyz", "sig-abc"))
         for concept in result["concepts"]:
             assert concept["company_id"] == "co-xyz"
@@ -355,19 +373,21 @@ class TestPromptBuilders:
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_feedback_weights_include_shared_patterns(sample_company):
-    with patch("backend.routers.campaigns.db_module.get_prompt_weights", AsyncMock(return_value={"tone_weight": 1.4})), patch(
-        "backend.routers.campaigns.db_module.get_shared_patterns",
-        AsyncMock(
-            return_value=[
-                {
-                    "description": "In SaaS, linkedin performs best for technical buyers.",
-                    "effect": {"recommended_channel": "linkedin"},
-                }
-            ]
-        ),
-    ):
-        merged = await _load_feedback_prompt_weights(sample_company)
+async def test_feedback_weights_include_shared_patterns(sample_company, monkeypatch):
+    async def fake_prompt_weights(*_args, **_kwargs):
+        return {"tone_weight": 1.4}
+
+    async def fake_shared_patterns(*_args, **_kwargs):
+        return [
+            {
+                "description": "In SaaS, linkedin performs best for technical buyers.",
+                "effect": {"recommended_channel": "linkedin"},
+            }
+        ]
+
+    monkeypatch.setattr("backend.routers.campaigns.db_module.get_prompt_weights", fake_prompt_weights)
+    monkeypatch.setattr("backend.routers.campaigns.db_module.get_shared_patterns", fake_shared_patterns)
+    merged = await _load_feedback_prompt_weights(sample_company)
 
     assert merged["tone_weight"] == pytest.approx(1.4)
     assert "learned_preferences" in merged
@@ -381,19 +401,27 @@ async def test_feedback_weights_include_shared_patterns(sample_company):
 @pytest.mark.unit
 class TestExtractConceptsFromResponse:
     def test_extracts_from_json_code_block(self, sample_company, sample_signals):
-        raw = _make_concepts_json(2)
+        raw = _make_concepts_json_str(2)
         text = f"Here are the campaigns:\n```json\n{raw}\n```"
         result = _extract_concepts_from_response(text, sample_company.id, sample_signals)
         assert len(result) == 2
         assert all(isinstance(c, CampaignConcept) for c in result)
 
     def test_extracts_from_format_tool_wrapper(self, sample_company, sample_signals):
-        concepts_list = json.loads(_make_concepts_json(3))
+        concepts_list = _make_concepts_json(3)
         payload = json.dumps({"concepts": concepts_list, "count": 3, "company_id": sample_company.id})
         text = f"Done! ```json\n{payload}\n```"
         result = _extract_concepts_from_response(text, sample_company.id, sample_signals)
         assert len(result) == 3
 
+    def test_brackets_inside_strings_do_not_end_span(self, sample_company, sample_signals):
+        concepts = _make_concepts_json(2)
+        concepts[0]["headline"] = 'Tricky "}]" headline {'
+        text = f"```json\n{json.dumps(concepts)}\n``` and a trailing {{brace}}"
+        result = _extract_concepts_from_response(text, sample_company.id, sample_signals)
+        assert len(result) == 2
+        assert result[0].headline == 'Tricky "}]" headline {'
+
     def test_returns_empty_on_no_json(self, sample_company, sample_signals):
         result = _extract_concepts_from_response(
             "I generated some campaigns but didn't format them.", sample_company.id, sample_signals
@@ -401,7 +429,7 @@ class TestExtractConceptsFromResponse:
         assert result == []
 
     def test_unknown_channel_normalised(self, sample_company, sample_signals):
-        concepts = json.loads(_make_concepts_json(1))
+        concepts = _make_concepts_json(1)
         concepts[0]["channel_recommendation"] = "snapchat"
         text = f"```json\n{json.dumps(concepts)}\n```"
         result = _extract_concepts_from_response(text, sample_company.id, sample_signals)
@@ -414,121 +442,138 @@ class TestExtractConceptsFromResponse:
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_persist_campaigns_writes_to_db(sample_company, sample_signals, tmp_path):
+async def test_persist_campaigns_writes_to_db(sample_company, sample_signals, temp_db):
     """Confirm _persist_campaigns saves concepts to the campaigns SQLite table."""
     import aiosqlite
-    import backend.database as db_module
-
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
-
     from backend.agents.campaign_gen import _persist_campaigns
-    from backend.database import init_db
-
-    try:
-        await init_db(test_db)
 
-        concepts = [
-            CampaignConcept(
-                company_id=sample_company.id,
-                trend_signal_id=sample_signals[0].id,
-                headline=f"Test Headline {i + 1}",
-                body_copy="Test body copy with enough words to make it valid and realistic enough.",
-                visual_direction="dark background, code terminal",
-                confidence_score=0.80 + i * 0.05,
-                channel_recommendation=Channel.LINKEDIN,
-                channel_reasoning="LinkedIn best for B2B reach.",
-            )
-            for i in range(3)
-        ]
-
-        await _persist_campaigns(concepts)
+    concepts = [
+        CampaignConcept(
+            company_id=sample_company.id,
+            trend_signal_id=sample_signals[0].id,
+            headline=f"Test Headline {i + 1}",
+            body_copy="Test body copy with enough words to make it valid and realistic enough.",
+            visual_direction="dark background, code terminal",
+            confidence_score=0.80 + i * 0.05,
+            channel_recommendation=Channel.LINKEDIN,
+            channel_reasoning="LinkedIn best for B2B reach.",
+        )
+        for i in range(3)
+    ]
 
-        async with aiosqlite.connect(test_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM campaigns")
-            count = (await cursor.fetchone())[0]
-            assert count == 3
+    await _persist_campaigns(concepts)
 
-            cursor = await db.execute("SELECT headline FROM campaigns ORDER BY headline")
-            rows = await cursor.fetchall()
-            headlines = [row[0] for row in rows]
-            assert "Test Headline 1" in headlines
+    async with aiosqlite.connect(temp_db) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM campaigns")
+        count = (await cursor.fetchone())[0]
+        assert count == 3
 
-    finally:
-        db_module.DB_PATH = original
+        cursor = await db.execute("SELECT headline FROM campaigns ORDER BY headline")
+        rows = await cursor.fetchall()
+        headlines = [row[0] for row in rows]
+        assert "Test Headline 1" in headlines
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_persist_agent_traces_writes_rows(sample_company, sample_signals, tmp_path):
+async def test_persist_agent_traces_writes_rows(sample_company, sample_signals, temp_db):
     """Confirm campaign agent trace rows are persisted alongside generated concepts."""
     import aiosqlite
-    import backend.database as db_module
-    from backend.database import init_db
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
+    concepts = [
+        CampaignConcept(
+            id=f"camp-{i}",
+            company_id=sample_company.id,
+            trend_signal_id=sample_signals[0].id,
+            headline=f"Trace headline {i}",
+            body_copy="Trace test body copy with enough words for validation and scoring.",
+            visual_direction="minimal",
+            confidence_score=0.8,
+            channel_recommendation=Channel.LINKEDIN,
+            channel_reasoning="B2B audience fit.",
+        )
+        for i in range(2)
+    ]
 
-    try:
-        await init_db(test_db)
-        concepts = [
-            CampaignConcept(
-                id=f"camp-{i}",
-                company_id=sample_company.id,
-                trend_signal_id=sample_signals[0].id,
-                headline=f"Trace headline {i}",
-                body_copy="Trace test body copy with enough words for validation and scoring.",
-                visual_direction="minimal",
-                confidence_score=0.8,
-                channel_recommendation=Channel.LINKEDIN,
-                channel_reasoning="B2B audience fit.",
-            )
-            for i in range(2)
-        ]
+    await _persist_agent_traces(
+        concepts=concepts,
+        company=sample_company,
+        signals=sample_signals,
+        latency_ms=1234,
+        braintrust_trace_id="trace-123",
+    )
 
-        await _persist_agent_traces(
-            concepts=concepts,
-            company=sample_company,
-            signals=sample_signals,
-            latency_ms=1234,
-            braintrust_trace_id="trace-123",
+    async with aiosqlite.connect(temp_db) as db:
+        cursor = await db.execute(
+            "SELECT agent_name, company_id, output_summary, braintrust_trace_id, latency_ms "
+            "FROM agent_traces ORDER BY created_at DESC"
         )
+        rows = await cursor.fetchall()
 
-        async with aiosqlite.connect(test_db) as db:
-            cursor = await db.execute(
-                "SELECT agent_name, company_id, output_summary, braintrust_trace_id, latency_ms "
-                "FROM agent_traces ORDER BY created_at DESC"
-            )
-            rows = await cursor.fetchall()
+    assert len(rows) == 2
+    assert all(r[0] == "campaign_gen" for r in rows)
+    assert all(r[1] == sample_company.id for r in rows)
+    assert all("campaign_id=camp-" in r[2] for r in rows)
+    assert all(r[3] == "trace-123" for r in rows)
+    assert all(r[4] == 1234 for r in rows)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_persist_all_writes_campaigns_and_traces(sample_company, sample_signals, temp_db):
+    """Confirm _persist_all writes campaigns and agent traces in one call."""
+    import aiosqlite
+
+    concepts = [
+        CampaignConcept(
+            id=f"camp-all-{i}",
+            company_id=sample_company.id,
+            trend_signal_id=sample_signals[0].id,
+            headline=f"Fused headline {i}",
+            body_copy="Fused persistence body copy with enough words for validation.",
+            visual_direction="minimal",
+            confidence_score=0.8,
+            channel_recommendation=Channel.TWITTER,
+            channel_reasoning="Fast-moving audience.",
+        )
+        for i in range(3)
+    ]
 
-        assert len(rows) == 2
-        assert all(r[0] == "campaign_gen" for r in rows)
-        assert all(r[1] == sample_company.id for r in rows)
-        assert all("campaign_id=camp-" in r[2] for r in rows)
-        assert all(r[3] == "trace-123" for r in rows)
-        assert all(r[4] == 1234 for r in rows)
+    await _persist_all(
+        concepts=concepts,
+        company=sample_company,
+        signals=sample_signals,
+        latency_ms=987,
+        braintrust_trace_id="trace-all",
+    )
+
+    async with aiosqlite.connect(temp_db) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM campaigns")
+        assert (await cursor.fetchone())[0] == 3
+        cursor = await db.execute(
+            "SELECT output_summary, braintrust_trace_id, latency_ms FROM agent_traces"
+        )
+        rows = await cursor.fetchall()
 
-    finally:
-        db_module.DB_PATH = original
+    assert len(rows) == 3
+    assert all("campaign_id=camp-all-" in r[0] for r in rows)
+    assert all(r[1] == "trace-all" for r in rows)
+    assert all(r[2] == 987 for r in rows)
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_campaign_db_row_round_trip(tmp_path):
+async def test_campaign_db_row_round_trip(monkeypatch):
     """Verify to_db_row + from_db_row recovers original data faithfully."""
     import aiosqlite
-    import backend.database as db_module
-    from backend.database import init_db
     from backend.agents.campaign_gen import _persist_campaigns
+    from backend.database import MEMORY_DB_URI, init_db
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
+    monkeypatch.setattr("backend.database.DB_PATH", MEMORY_DB_URI)
 
-    try:
-        await init_db(test_db)
+    # Holding this connection open keeps the shared in-memory DB alive.
+    async with aiosqlite.connect(MEMORY_DB_URI, uri=True) as db:
+        await init_db(MEMORY_DB_URI)
         concept = CampaignConcept(
             id="round-trip-id",
             company_id="co-001",
@@ -542,94 +587,77 @@ async def test_campaign_db_row_round_trip(tmp_path):
         )
         await _persist_campaigns([concept])
 
-        async with aiosqlite.connect(test_db) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT * FROM campaigns WHERE id = ?", ("round-trip-id",))
-            row = dict(await cursor.fetchone())
+        db.row_factory = aiosqlite.Row
+        cursor = await db.execute("SELECT * FROM campaigns WHERE id = ?", ("round-trip-id",))
+        row = dict(await cursor.fetchone())
 
-        restored = CampaignConcept.from_db_row(row)
-        assert restored.id == "round-trip-id"
-        assert restored.headline == "Round Trip Test Headline"
-        assert restored.channel_recommendation == Channel.NEWSLETTER
-        assert abs(restored.confidence_score - 0.77) < 0.001
-
-    finally:
-        db_module.DB_PATH = original
+    restored = CampaignConcept.from_db_row(row)
+    assert restored.id == "round-trip-id"
+    assert restored.headline == "Round Trip Test Headline"
+    assert restored.channel_recommendation == Channel.NEWSLETTER
+    assert abs(restored.confidence_score - 0.77) < 0.001
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # End-to-End Tests — Full ADK Agent Run (requires GEMINI_API_KEY)
 # ──────────────────────────────────────────────────────────────────────────────
 
-def _gemini_key_available() -> bool:
-    key = os.getenv("GEMINI_API_KEY", "")
-    return bool(key) and key != "your_gemini_api_key_here"
-
-
 @pytest.mark.e2e
 @pytest.mark.asyncio
-@pytest.mark.skipif(not _gemini_key_available(), reason="GEMINI_API_KEY not configured")
-async def test_full_agent_run_returns_concepts(sample_company, sample_signals, tmp_path):
+@pytest.mark.requires_gemini
+async def test_full_agent_run_returns_concepts(sample_company, sample_signals, temp_db, campaign_gen_agent):
     """Full end-to-end: Agent 3 generates concepts via Gemini + ADK."""
-    import backend.database as db_module
     from backend.agents.campaign_gen import run_campaign_agent
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
+    response = await run_campaign_agent(
+        company=sample_company,
+        signals=sample_signals,
+        n_concepts=3,
+        persist=True,
+        agent=campaign_gen_agent,
+    )
 
-    try:
-        response = await run_campaign_agent(
-            company=sample_company,
-            signals=sample_signals,
-            n_concepts=3,
-            persist=True,
+    assert isinstance(response, CampaignGenerationResponse)
+    assert response.success
+    assert len(response.concepts) >= 1
+    assert response.latency_ms > 0
+
+    for c in response.concepts:
+        assert isinstance(c, CampaignConcept)
+        assert c.headline
+        assert c.body_copy
+        assert c.channel_recommendation in list(Channel)
+        assert 0.0 <= c.confidence_score <= 1.0
+
+    lines = [f"\n--- Agent 3 Live Output ({len(response.concepts)} concepts) ---"]
+    for i, c in enumerate(response.concepts, 1):
+        lines.append(
+            f"\nConcept {i}: {c.headline}\n"
+            f"  Channel    : {c.channel_recommendation.value}\n"
+            f"  Confidence : {c.confidence_score:.0%}\n"
+            f"  Body       : {c.body_copy[:120]}..."
         )
-
-        assert isinstance(response, CampaignGenerationResponse)
-        assert response.success
-        assert len(response.concepts) >= 1
-        assert response.latency_ms > 0
-
-        for c in response.concepts:
-            assert isinstance(c, CampaignConcept)
-            assert c.headline
-            assert c.body_copy
-            assert c.channel_recommendation in list(Channel)
-            assert 0.0 <= c.confidence_score <= 1.0
-
-        print(f"\n--- Agent 3 Live Output ({len(response.concepts)} concepts) ---")
-        for i, c in enumerate(response.concepts, 1):
-            print(f"\nConcept {i}: {c.headline}")
-            print(f"  Channel    : {c.channel_recommendation.value}")
-            print(f"  Confidence : {c.confidence_score:.0%}")
-            print(f"  Body       : {c.body_copy[:120]}...")
-
-    finally:
-        db_module.DB_PATH = original
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 @pytest.mark.e2e
 @pytest.mark.asyncio
-@pytest.mark.skipif(not _gemini_key_available(), reason="GEMINI_API_KEY not configured")
-async def test_prompt_weights_applied(sample_company, sample_signals, tmp_path):
+@pytest.mark.requires_gemini
+async def test_prompt_weights_applied(sample_company, sample_signals, temp_db, campaign_gen_agent):
     """Concepts with a high tone_weight should feel tonally different from neutral."""
-    import backend.database as db_module
     from backend.agents.campaign_gen import run_campaign_agent
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
-
-    try:
-        r_neutral = await run_campaign_agent(
+    # Independent runs (each copies the agent into its own session): fan out together
+    r_neutral, r_aggressive = await asyncio.gather(
+        run_campaign_agent(
             company=sample_company,
             signals=[sample_signals[0]],
             prompt_weights={},
             n_concepts=1,
             persist=False,
-        )
-        r_aggressive = await run_campaign_agent(
+            agent=campaign_gen_agent,
+        ),
+        run_campaign_agent(
             company=sample_company,
             signals=[sample_signals[0]],
             prompt_weights={
@@ -638,47 +666,36 @@ async def test_prompt_weights_applied(sample_company, sample_signals, tmp_path):
             },
             n_concepts=1,
             persist=False,
-        )
-
-        assert r_neutral.success
-        assert r_aggressive.success
-        print(f"\nNeutral   : {r_neutral.concepts[0].headline}")
-        print(f"Aggressive: {r_aggressive.concepts[0].headline}")
+            agent=campaign_gen_agent,
+        ),
+    )
 
-    finally:
-        db_module.DB_PATH = original
+    assert r_neutral.success
+    assert r_aggressive.success
+    print(f"\nNeutral   : {r_neutral.concepts[0].headline}")
+    print(f"Aggressive: {r_aggressive.concepts[0].headline}")
 
 
 @pytest.mark.e2e
 @pytest.mark.asyncio
-@pytest.mark.skipif(not _gemini_key_available(), reason="GEMINI_API_KEY not configured")
-async def test_no_persist_does_not_write_to_db(sample_company, sample_signals, tmp_path):
+@pytest.mark.requires_gemini
+async def test_no_persist_does_not_write_to_db(sample_company, sample_signals, temp_db, campaign_gen_agent):
     """persist=False should generate concepts but not touch the database."""
     import aiosqlite
-    import backend.database as db_module
     from backend.agents.campaign_gen import run_campaign_agent
-    from backend.database import init_db
-
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
-
-    try:
-        await init_db(test_db)
-        response = await run_campaign_agent(
-            company=sample_company,
-            signals=[sample_signals[0]],
-            n_concepts=1,
-            persist=False,
-        )
 
-        assert response.success
+    response = await run_campaign_agent(
+        company=sample_company,
+        signals=[sample_signals[0]],
+        n_concepts=1,
+        persist=False,
+        agent=campaign_gen_agent,
+    )
 
-        async with aiosqlite.connect(test_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM campaigns")
-            count = (await cursor.fetchone())[0]
+    assert response.success
 
-        assert count == 0, "persist=False should not write to DB"
+    async with aiosqlite.connect(temp_db) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM campaigns")
+        count = (await cursor.fetchone())[0]
 
-    finally:
-        db_module.DB_PATH = original
+    assert count == 0, "persist=False should not write to DB"
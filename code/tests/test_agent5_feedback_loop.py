@@ -3,7 +3,8 @@ Tests for Agent 5 — Feedback Loop Agent (Meta-Agent)
 
 Run:
     cd code
-    pytest tests/test_agent5_feedback_loop.py -v
+    pytest tests/test_agent5_feedback_loop.py -v      # -n auto (xdist) by default
+    pytest tests/test_agent5_feedback_loop.py -v -n0  # single process
 
 Two test layers:
   1. Unit tests  — no API key required (tools in isolation, in-memory DB)
@@ -17,28 +18,25 @@ Test coverage:
 """
 from __future__ import annotations
 
-import asyncio
-import json
-import sys
+import os
+import sqlite3
 import uuid
 from datetime import datetime
-from pathlib import Path
 
 import pytest
 import pytest_asyncio
-import aiosqlite
-
-# ── Make backend importable from the code/ root ───────────────────────────────
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.database import init_db, CREATE_TABLES_SQL
-from backend.config import settings
+from backend.jsonio import dumps as _dumps, loads as _loads
 
 # ── Agent 5 imports ───────────────────────────────────────────────────────────
 from backend.agents.feedback_loop import (
     get_campaign_performance,
+    get_campaign_performance_obj,
     compute_prompt_weights,
+    compute_prompt_weights_obj,
     save_prompt_weights,
+    save_prompt_weights_obj,
     get_cross_company_metrics,
     extract_style_patterns,
     save_shared_pattern,
@@ -73,30 +71,73 @@ def _is_transient_gemini_error(error: object) -> bool:
     ])
 
 
+def _query_scalar(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> sqlite3.Row | None:
+    """Run one verification query and return the first row.
+
+    The cursor is closed straight away so the shared-cache read lock is not
+    held while tools write on their own connections.
+    """
+    cur = conn.execute(sql, params)
+    try:
+        return cur.fetchone()
+    finally:
+        cur.close()
+
+
 # =============================================================================
 # Fixtures
 # =============================================================================
 
+@pytest.fixture(scope="session")
+def schema_template():
+    """Schema built once per process; tmp_db page-copies it instead of re-running the DDL.
+
+    (sqlite3's deserialize() would detach the target connection from the shared
+    cache, so the tools' connections wouldn't see it — hence backup for tmp_db.)
+    """
+    template = sqlite3.connect(":memory:")
+    template.executescript(CREATE_TABLES_SQL)
+    yield template
+    template.close()
+
+
+def _clone_schema(template: sqlite3.Connection, dst: sqlite3.Connection) -> None:
+    """Copy the schema template into a private (non-shared-cache) connection."""
+    if hasattr(dst, "deserialize"):  # Python 3.11+
+        dst.deserialize(template.serialize())
+    else:
+        template.backup(dst)
+
+
 @pytest_asyncio.fixture
-async def tmp_db(tmp_path, monkeypatch):
-    """Create a fresh in-memory SQLite database for each test."""
-    db_file = tmp_path / "test_signal.db"
+async def tmp_db(monkeypatch, schema_template):
+    """Create a fresh shared-cache in-memory SQLite database for each test.
+
+    Tools open their own connections by URI, so one connection is held open
+    for the fixture's lifetime — the DB vanishes once its last connection closes.
+    """
+    # Memory DBs are per-process, so xdist workers can't collide; the worker id
+    # in the name just makes a DB traceable to its worker when debugging.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    db_uri = f"file:signal_{worker}_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
     # Patch the module-level DB_PATH so all tools use this temp DB
     import backend.database as db_mod
-    monkeypatch.setattr(db_mod, "DB_PATH", db_file)
+    monkeypatch.setattr(db_mod, "DB_PATH", db_uri)
 
-    async with aiosqlite.connect(db_file) as db:
-        await db.executescript(CREATE_TABLES_SQL)
-        await db.commit()
+    async with db_mod.connect_db(db_uri) as keeper:
+        dst = sqlite3.connect(db_uri, uri=True)
+        try:
+            schema_template.backup(dst)
+        finally:
+            dst.close()
+        yield db_uri
 
-    return db_file
 
-
-@pytest_asyncio.fixture
-async def seeded_db(tmp_db):
+@pytest.fixture(scope="session")
+def _seeded_db_session(schema_template):
     """
-    Seed the temp DB with:
+    Build the seeded DB once per session in a private in-memory SQLite DB:
       - 1 company
       - 2 trend signals
       - 3 campaigns linked to the company + signals
@@ -106,56 +147,86 @@ async def seeded_db(tmp_db):
     signal_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
     campaign_ids = [str(uuid.uuid4()) for _ in range(3)]
 
-    async with aiosqlite.connect(tmp_db) as db:
-        # Company
-        await db.execute(
-            """INSERT INTO companies (id, name, industry, tone_of_voice,
-               target_audience, campaign_goals)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (company_id, "Acme Corp", "B2B SaaS", "professional",
-             "CTOs and data engineers", "increase signups"),
-        )
-
-        # Trend signals
-        for i, sig_id in enumerate(signal_ids):
-            await db.execute(
-                """INSERT INTO trend_signals (id, title, category,
-                   probability, probability_momentum, volume, volume_velocity)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (sig_id, f"Signal {i}", "tech", 0.65 + i * 0.1,
-                 0.05, 50000.0 + i * 10000, 1200.0 + i * 500),
-            )
-
-        # Campaigns
-        channels = ["twitter", "linkedin", "twitter"]
-        for i, camp_id in enumerate(campaign_ids):
-            await db.execute(
-                """INSERT INTO campaigns (id, company_id, trend_signal_id,
-                   headline, body_copy, channel_recommendation,
-                   channel_reasoning, confidence_score, status)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'posted')""",
-                (camp_id, company_id, signal_ids[i % 2],
-                 f"Headline {i}", f"Body copy for campaign {i} with enough words to be realistic content here.",
-                 channels[i], "good fit", 0.7 + i * 0.05),
-            )
-
-        # Metrics
-        eng_rates = [0.045, 0.082, 0.031]
-        sentiments = [0.3, 0.6, -0.1]
-        for i, (camp_id, eng, sent) in enumerate(zip(campaign_ids, eng_rates, sentiments)):
-            await db.execute(
-                """INSERT INTO campaign_metrics (id, campaign_id, channel,
-                   impressions, clicks, engagement_rate, sentiment_score)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (str(uuid.uuid4()), camp_id, channels[i],
-                 10000 + i * 5000, int((10000 + i * 5000) * eng),
-                 eng, sent),
-            )
-
-        await db.commit()
-
-    return {"db": tmp_db, "company_id": company_id, "signal_ids": signal_ids,
-            "campaign_ids": campaign_ids}
+    channels = ["twitter", "linkedin", "twitter"]
+    eng_rates = [0.045, 0.082, 0.031]
+    sentiments = [0.3, 0.6, -0.1]
+
+    signals_params = [
+        (sig_id, f"Signal {i}", "tech", 0.65 + i * 0.1,
+         0.05, 50000.0 + i * 10000, 1200.0 + i * 500)
+        for i, sig_id in enumerate(signal_ids)
+    ]
+    campaigns_params = [
+        (camp_id, company_id, signal_ids[i % 2],
+         f"Headline {i}", f"Body copy for campaign {i} with enough words to be realistic content here.",
+         channels[i], "good fit", 0.7 + i * 0.05)
+        for i, camp_id in enumerate(campaign_ids)
+    ]
+    metrics_params = [
+        (str(uuid.uuid4()), camp_id, channels[i],
+         10000 + i * 5000, int((10000 + i * 5000) * eng), eng, sent)
+        for i, (camp_id, eng, sent) in enumerate(zip(campaign_ids, eng_rates, sentiments))
+    ]
+
+    # isolation_level=None: no implicit transactions, so BEGIN/COMMIT below
+    # wrap the whole seed in exactly one.
+    db = sqlite3.connect(":memory:", isolation_level=None)
+    _clone_schema(schema_template, db)
+
+    db.execute("BEGIN")
+    db.execute(
+        """INSERT INTO companies (id, name, industry, tone_of_voice,
+           target_audience, campaign_goals)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (company_id, "Acme Corp", "B2B SaaS", "professional",
+         "CTOs and data engineers", "increase signups"),
+    )
+    db.executemany(
+        """INSERT INTO trend_signals (id, title, category,
+           probability, probability_momentum, volume, volume_velocity)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        signals_params,
+    )
+    db.executemany(
+        """INSERT INTO campaigns (id, company_id, trend_signal_id,
+           headline, body_copy, channel_recommendation,
+           channel_reasoning, confidence_score, status)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'posted')""",
+        campaigns_params,
+    )
+    db.executemany(
+        """INSERT INTO campaign_metrics (id, campaign_id, channel,
+           impressions, clicks, engagement_rate, sentiment_score)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        metrics_params,
+    )
+    db.execute("COMMIT")
+    # Planner stats travel with the page copy into every seeded_db.
+    db.execute("ANALYZE")
+
+    yield db, {"company_id": company_id, "signal_ids": signal_ids,
+               "campaign_ids": campaign_ids}
+    db.close()
+
+
+@pytest.fixture
+def seeded_db(tmp_db, _seeded_db_session):
+    """Per-test copy of the session seed, restored into tmp_db.
+
+    Tools commit on their own connections, so a SAVEPOINT held by the fixture
+    could not roll their writes back; instead each test gets a fresh page copy
+    of the seeded DB via ``sqlite3.Connection.backup``. ``read_conn`` in the
+    returned dict is a sync connection shared by the test's DB assertions.
+    """
+    template, ids = _seeded_db_session
+    read_conn = sqlite3.connect(tmp_db, uri=True, check_same_thread=False)
+    try:
+        template.backup(read_conn)
+        read_conn.row_factory = sqlite3.Row
+        # The connection that restored the seed stays open for assertions.
+        yield {"db": tmp_db, "read_conn": read_conn, **ids}
+    finally:
+        read_conn.close()
 
 
 # =============================================================================
@@ -203,8 +274,8 @@ class TestFeedbackModels:
         )
         row = p.to_db_row()
         assert row["pattern_type"] == "channel"
-        assert json.loads(row["conditions"])["industry"] == "B2B SaaS"
-        assert json.loads(row["effect"])["recommended_channel"] == "linkedin"
+        assert _loads(row["conditions"])["industry"] == "B2B SaaS"
+        assert _loads(row["effect"])["recommended_channel"] == "linkedin"
 
     def test_calibration_result_to_db_row(self):
         cal = CalibrationResult(
@@ -239,7 +310,7 @@ class TestLoop1Tools:
     def test_get_campaign_performance_empty_db(self, seeded_db):
         """Returns JSON with empty list for unknown company."""
         result = get_campaign_performance("nonexistent-company-id")
-        data = json.loads(result)
+        data = _loads(result)
         assert data["count"] == 0
         assert data["campaigns"] == []
 
@@ -247,7 +318,7 @@ class TestLoop1Tools:
         """Returns performance data for a seeded company."""
         company_id = seeded_db["company_id"]
         result = get_campaign_performance(company_id)
-        data = json.loads(result)
+        data = _loads(result)
         assert data["count"] == 3
         assert data["company_id"] == company_id
         for camp in data["campaigns"]:
@@ -255,25 +326,27 @@ class TestLoop1Tools:
             assert "channel" in camp
             assert "headline" in camp
 
-    def test_compute_prompt_weights_empty_input(self):
-        """Empty campaigns → returns no weight updates."""
-        perf_json = json.dumps({"company_id": "cmp-1", "campaigns": [], "count": 0})
-        result = compute_prompt_weights(perf_json, "cmp-1")
-        data = json.loads(result)
-        assert data["weight_updates"] == []
-        assert data["campaigns_analyzed"] == 0
-
-    def test_compute_prompt_weights_invalid_json(self):
-        result = compute_prompt_weights("not-valid-json", "cmp-1")
-        data = json.loads(result)
-        assert "error" in data
+    @pytest.mark.parametrize(
+        "perf_json, expected",
+        [
+            (_dumps({"company_id": "cmp-1", "campaigns": [], "count": 0}),
+             {"weight_updates": [], "campaigns_analyzed": 0}),
+            ("not-valid-json", {"weight_updates": [], "error": "Invalid performance_json"}),
+        ],
+        ids=["empty_input", "invalid_json"],
+    )
+    def test_compute_prompt_weights_no_data(self, perf_json, expected):
+        """Empty campaigns or unparseable input → no weight updates."""
+        data = _loads(compute_prompt_weights(perf_json, "cmp-1"))
+        for key, value in expected.items():
+            assert data[key] == value
 
     def test_compute_prompt_weights_with_data(self, seeded_db):
         """With real performance data, should produce weight updates."""
         company_id = seeded_db["company_id"]
         perf_json = get_campaign_performance(company_id)
         result = compute_prompt_weights(perf_json, company_id)
-        data = json.loads(result)
+        data = _loads(result)
         assert data["company_id"] == company_id
         assert data["campaigns_analyzed"] == 3
         assert len(data["weight_updates"]) >= 1
@@ -286,7 +359,7 @@ class TestLoop1Tools:
     def test_save_prompt_weights_persists_to_db(self, seeded_db):
         """Saved weights are readable from the DB."""
         company_id = seeded_db["company_id"]
-        weights_json = json.dumps({
+        weights_json = _dumps({
             "company_id": company_id,
             "weight_updates": [
                 {"weight_key": "tone_aggressive", "weight_value": 1.5, "reasoning": "test"},
@@ -294,63 +367,76 @@ class TestLoop1Tools:
             ],
         })
         result = save_prompt_weights(weights_json)
-        data = json.loads(result)
+        data = _loads(result)
         assert data["success"] is True
         assert data["saved"] == 2
 
         # Verify DB
-        async def _check():
-            async with aiosqlite.connect(seeded_db["db"]) as db:
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute(
-                    "SELECT COUNT(*) AS cnt FROM prompt_weights WHERE company_id=?",
-                    (company_id,),
-                )
-                row = await cur.fetchone()
-                return row["cnt"]
-
-        count = asyncio.run(_check())
-        assert count == 2
+        row = _query_scalar(
+            seeded_db["read_conn"],
+            "SELECT COUNT(*) AS cnt FROM prompt_weights WHERE company_id=?",
+            (company_id,),
+        )
+        assert row["cnt"] == 2
 
     def test_save_prompt_weights_upsert(self, seeded_db):
         """Saving the same key twice updates rather than duplicating."""
         company_id = seeded_db["company_id"]
-        weights_json = json.dumps({
+        weights_json = _dumps({
             "company_id": company_id,
             "weight_updates": [{"weight_key": "tone_positive", "weight_value": 1.3, "reasoning": "first"}],
         })
         save_prompt_weights(weights_json)
 
         # Update the same key with a different value
-        weights_json2 = json.dumps({
+        weights_json2 = _dumps({
             "company_id": company_id,
             "weight_updates": [{"weight_key": "tone_positive", "weight_value": 1.7, "reasoning": "update"}],
         })
         save_prompt_weights(weights_json2)
 
-        async def _check():
-            async with aiosqlite.connect(seeded_db["db"]) as db:
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute(
-                    "SELECT weight_value FROM prompt_weights WHERE company_id=? AND weight_key='tone_positive'",
-                    (company_id,),
-                )
-                row = await cur.fetchone()
-                return row["weight_value"] if row else None
-
-        val = asyncio.run(_check())
-        assert val == pytest.approx(1.7, abs=0.01)
-
-    def test_save_prompt_weights_empty_list(self):
-        result = save_prompt_weights(json.dumps({"company_id": "c", "weight_updates": []}))
-        data = json.loads(result)
-        assert data["saved"] == 0
-        assert data["success"] is True
+        row = _query_scalar(
+            seeded_db["read_conn"],
+            "SELECT weight_value FROM prompt_weights WHERE company_id=? AND weight_key='tone_positive'",
+            (company_id,),
+        )
+        assert row is not None
+        assert row["weight_value"] == pytest.approx(1.7, abs=0.01)
 
-    def test_save_prompt_weights_invalid_json(self):
-        result = save_prompt_weights("bad json!")
-        data = json.loads(result)
-        assert data["success"] is False
+    def test_save_prompt_weights_persists_batch_together(self, seeded_db):
+        """All ten weights are persisted, stamped with one shared timestamp."""
+        company_id = seeded_db["company_id"]
+        weights_json = _dumps({
+            "company_id": company_id,
+            "weight_updates": [
+                {"weight_key": f"key_{i}", "weight_value": 1.0 + i / 10, "reasoning": "test"}
+                for i in range(10)
+            ],
+        })
+        data = _loads(save_prompt_weights(weights_json))
+        assert data["saved"] == 10
+
+        rows = seeded_db["read_conn"].execute(
+            "SELECT weight_key, weight_value, updated_at FROM prompt_weights WHERE company_id=?",
+            (company_id,),
+        ).fetchall()
+        assert {r["weight_key"]: r["weight_value"] for r in rows} == {
+            f"key_{i}": pytest.approx(1.0 + i / 10) for i in range(10)
+        }
+        assert len({r["updated_at"] for r in rows}) == 1
+
+    @pytest.mark.parametrize(
+        "weights_json, expected",
+        [
+            (_dumps({"company_id": "c", "weight_updates": []}), {"saved": 0, "success": True}),
+            ("bad json!", {"saved": 0, "success": False}),
+        ],
+        ids=["empty_list", "invalid_json"],
+    )
+    def test_save_prompt_weights_nothing_saved(self, weights_json, expected):
+        data = _loads(save_prompt_weights(weights_json))
+        for key, value in expected.items():
+            assert data[key] == value
 
 
 # =============================================================================
@@ -361,36 +447,34 @@ class TestLoop2Tools:
     def test_get_cross_company_metrics_empty(self, tmp_db):
         """Empty DB returns empty list."""
         result = get_cross_company_metrics(min_campaigns=1)
-        data = json.loads(result)
+        data = _loads(result)
         assert data["companies"] == []
 
     def test_get_cross_company_metrics_with_data(self, seeded_db):
         """Returns aggregated rows from seeded data."""
         result = get_cross_company_metrics(min_campaigns=1)
-        data = json.loads(result)
+        data = _loads(result)
         assert len(data["companies"]) >= 1
         for row in data["companies"]:
             assert "industry" in row
             assert "avg_engagement" in row
             assert "channel" in row
 
-    def test_extract_style_patterns_empty(self):
-        """Empty metrics → no patterns."""
-        metrics_json = json.dumps({"companies": [], "total_campaigns": 0})
-        result = extract_style_patterns(metrics_json)
-        data = json.loads(result)
+    @pytest.mark.parametrize(
+        "metrics_json",
+        [_dumps({"companies": [], "total_campaigns": 0}), "not json"],
+        ids=["empty", "invalid_json"],
+    )
+    def test_extract_style_patterns_no_data(self, metrics_json):
+        """Empty metrics or unparseable input → no patterns."""
+        data = _loads(extract_style_patterns(metrics_json))
         assert data["patterns"] == []
 
-    def test_extract_style_patterns_invalid_json(self):
-        result = extract_style_patterns("not json")
-        data = json.loads(result)
-        assert "error" in data or data["patterns"] == []
-
     def test_extract_style_patterns_with_data(self, seeded_db):
         """With seeded data, extracts at least one pattern."""
         metrics_json = get_cross_company_metrics(min_campaigns=1)
         result = extract_style_patterns(metrics_json)
-        data = json.loads(result)
+        data = _loads(result)
         assert isinstance(data["patterns"], list)
         for p in data["patterns"]:
             assert "pattern_type" in p
@@ -400,7 +484,7 @@ class TestLoop2Tools:
 
     def test_save_shared_pattern_persists(self, seeded_db):
         """Saved pattern appears in DB."""
-        pattern_json = json.dumps({
+        pattern_json = _dumps({
             "pattern_type": "channel",
             "description": "LinkedIn wins for B2B SaaS at 8.2% engagement.",
             "conditions": {"industry": "B2B SaaS"},
@@ -409,25 +493,16 @@ class TestLoop2Tools:
             "sample_size": 12,
         })
         result = save_shared_pattern(pattern_json)
-        data = json.loads(result)
+        data = _loads(result)
         assert data["success"] is True
         assert "pattern_id" in data
 
-        async def _check():
-            async with aiosqlite.connect(seeded_db["db"]) as db:
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute(
-                    "SELECT COUNT(*) AS cnt FROM shared_patterns"
-                )
-                row = await cur.fetchone()
-                return row["cnt"]
-
-        count = asyncio.run(_check())
-        assert count == 1
+        row = _query_scalar(seeded_db["read_conn"], "SELECT COUNT(*) AS cnt FROM shared_patterns")
+        assert row["cnt"] == 1
 
     def test_save_shared_pattern_invalid_json(self):
         result = save_shared_pattern("{{bad")
-        data = json.loads(result)
+        data = _loads(result)
         assert data["success"] is False
 
 
@@ -435,18 +510,63 @@ class TestLoop2Tools:
 # Loop 3 Tool Tests
 # =============================================================================
 
+# Synthetic Loop 3 payloads, serialised once at import
+_ACCURACY_RANGE_PAIRS_JSON = _dumps({
+    "pairs": [
+        {
+            "signal_id": "s1", "signal_category": "crypto",
+            "probability": 0.9, "probability_momentum": 0.1,
+            "volume": 100000, "volume_velocity": 5000,
+            "company_type": "Fintech", "engagement_rate": 0.0001,
+            "impressions": 100,
+        },
+        {
+            "signal_id": "s2", "signal_category": "crypto",
+            "probability": 0.95, "probability_momentum": 0.15,
+            "volume": 200000, "volume_velocity": 8000,
+            "company_type": "Fintech", "engagement_rate": 0.0002,
+            "impressions": 200,
+        },
+    ],
+    "count": 2,
+})
+
+_CALIBRATION_PERSIST_JSON = _dumps({
+    "calibrations": [
+        {
+            "signal_category": "crypto",
+            "probability_threshold": 0.75,
+            "volume_velocity_threshold": 2500.0,
+            "predicted_engagement": 0.05,
+            "actual_engagement": 0.048,
+            "accuracy_score": 0.96,
+            "company_type": "Fintech",
+        },
+        {
+            "signal_category": "politics",
+            "probability_threshold": 0.6,
+            "volume_velocity_threshold": 1000.0,
+            "predicted_engagement": 0.03,
+            "actual_engagement": 0.04,
+            "accuracy_score": 0.75,
+            "company_type": "Media",
+        },
+    ]
+})
+
+
 class TestLoop3Tools:
     def test_get_signal_engagement_pairs_empty(self, tmp_db):
         """Empty DB returns empty pairs."""
         result = get_signal_engagement_pairs()
-        data = json.loads(result)
+        data = _loads(result)
         assert data["count"] == 0
         assert data["pairs"] == []
 
     def test_get_signal_engagement_pairs_with_data(self, seeded_db):
         """Returns pairs from seeded data."""
         result = get_signal_engagement_pairs()
-        data = json.loads(result)
+        data = _loads(result)
         assert data["count"] >= 1
         for pair in data["pairs"]:
             assert "signal_category" in pair
@@ -454,23 +574,21 @@ class TestLoop3Tools:
             assert "engagement_rate" in pair
             assert "company_type" in pair
 
-    def test_compute_calibration_empty(self):
-        """Empty pairs → no calibrations."""
-        pairs_json = json.dumps({"pairs": [], "count": 0})
-        result = compute_calibration(pairs_json)
-        data = json.loads(result)
+    @pytest.mark.parametrize(
+        "pairs_json",
+        [_dumps({"pairs": [], "count": 0}), "!!!"],
+        ids=["empty", "invalid_json"],
+    )
+    def test_compute_calibration_no_data(self, pairs_json):
+        """Empty pairs or unparseable input → no calibrations."""
+        data = _loads(compute_calibration(pairs_json))
         assert data["calibrations"] == []
 
-    def test_compute_calibration_invalid_json(self):
-        result = compute_calibration("!!!")
-        data = json.loads(result)
-        assert "error" in data or data["calibrations"] == []
-
     def test_compute_calibration_with_data(self, seeded_db):
         """With seeded data, produces calibration entries."""
         pairs_json = get_signal_engagement_pairs()
         result = compute_calibration(pairs_json)
-        data = json.loads(result)
+        data = _loads(result)
         assert isinstance(data["calibrations"], list)
         for cal in data["calibrations"]:
             assert "signal_category" in cal
@@ -481,80 +599,34 @@ class TestLoop3Tools:
 
     def test_compute_calibration_accuracy_range(self):
         """Accuracy score is always in [0, 1] even for extreme inputs."""
-        pairs_json = json.dumps({
-            "pairs": [
-                {
-                    "signal_id": "s1", "signal_category": "crypto",
-                    "probability": 0.9, "probability_momentum": 0.1,
-                    "volume": 100000, "volume_velocity": 5000,
-                    "company_type": "Fintech", "engagement_rate": 0.0001,
-                    "impressions": 100,
-                },
-                {
-                    "signal_id": "s2", "signal_category": "crypto",
-                    "probability": 0.95, "probability_momentum": 0.15,
-                    "volume": 200000, "volume_velocity": 8000,
-                    "company_type": "Fintech", "engagement_rate": 0.0002,
-                    "impressions": 200,
-                },
-            ],
-            "count": 2,
-        })
-        result = compute_calibration(pairs_json)
-        data = json.loads(result)
+        result = compute_calibration(_ACCURACY_RANGE_PAIRS_JSON)
+        data = _loads(result)
         for cal in data["calibrations"]:
             assert 0.0 <= cal["accuracy_score"] <= 1.0
             assert cal["predicted_engagement"] >= 0.0
 
     def test_save_calibration_persists(self, seeded_db):
         """Saved calibrations appear in DB."""
-        calibrations_json = json.dumps({
-            "calibrations": [
-                {
-                    "signal_category": "crypto",
-                    "probability_threshold": 0.75,
-                    "volume_velocity_threshold": 2500.0,
-                    "predicted_engagement": 0.05,
-                    "actual_engagement": 0.048,
-                    "accuracy_score": 0.96,
-                    "company_type": "Fintech",
-                },
-                {
-                    "signal_category": "politics",
-                    "probability_threshold": 0.6,
-                    "volume_velocity_threshold": 1000.0,
-                    "predicted_engagement": 0.03,
-                    "actual_engagement": 0.04,
-                    "accuracy_score": 0.75,
-                    "company_type": "Media",
-                },
-            ]
-        })
-        result = save_calibration(calibrations_json)
-        data = json.loads(result)
+        result = save_calibration(_CALIBRATION_PERSIST_JSON)
+        data = _loads(result)
         assert data["success"] is True
         assert data["saved"] == 2
 
-        async def _check():
-            async with aiosqlite.connect(seeded_db["db"]) as db:
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute("SELECT COUNT(*) AS cnt FROM signal_calibration")
-                row = await cur.fetchone()
-                return row["cnt"]
-
-        count = asyncio.run(_check())
-        assert count == 2
-
-    def test_save_calibration_empty(self):
-        result = save_calibration(json.dumps({"calibrations": []}))
-        data = json.loads(result)
-        assert data["saved"] == 0
-        assert data["success"] is True
+        row = _query_scalar(seeded_db["read_conn"], "SELECT COUNT(*) AS cnt FROM signal_calibration")
+        assert row["cnt"] == 2
 
-    def test_save_calibration_invalid_json(self):
-        result = save_calibration("not json")
-        data = json.loads(result)
-        assert data["success"] is False
+    @pytest.mark.parametrize(
+        "calibrations_json, expected",
+        [
+            (_dumps({"calibrations": []}), {"saved": 0, "success": True}),
+            ("not json", {"saved": 0, "success": False}),
+        ],
+        ids=["empty", "invalid_json"],
+    )
+    def test_save_calibration_nothing_saved(self, calibrations_json, expected):
+        data = _loads(save_calibration(calibrations_json))
+        for key, value in expected.items():
+            assert data[key] == value
 
 
 # =============================================================================
@@ -568,13 +640,10 @@ class TestToolPipelines:
         """Full Loop 1 pipeline: get → compute → save."""
         company_id = seeded_db["company_id"]
 
-        perf_json = get_campaign_performance(company_id)
-        weights_json = compute_prompt_weights(perf_json, company_id)
-        save_result = save_prompt_weights(weights_json)
-
-        perf = json.loads(perf_json)
-        weights = json.loads(weights_json)
-        saved = json.loads(save_result)
+        # Object variants: same pipeline the string tools wrap, without re-parsing
+        perf = get_campaign_performance_obj(company_id)
+        weights = compute_prompt_weights_obj(perf, company_id)
+        saved = save_prompt_weights_obj(weights)
 
         assert perf["count"] == 3
         assert weights["campaigns_analyzed"] == 3
@@ -585,12 +654,12 @@ class TestToolPipelines:
         """Full Loop 2 pipeline: get → extract → save."""
         metrics_json = get_cross_company_metrics(min_campaigns=1)
         patterns_json = extract_style_patterns(metrics_json)
-        patterns = json.loads(patterns_json)
+        patterns = _loads(patterns_json)
 
         save_results = []
         for p in patterns.get("patterns", []):
-            res = save_shared_pattern(json.dumps(p))
-            save_results.append(json.loads(res))
+            res = save_shared_pattern(_dumps(p))
+            save_results.append(_loads(res))
 
         for res in save_results:
             assert res["success"] is True
@@ -601,31 +670,24 @@ class TestToolPipelines:
         calibrations_json = compute_calibration(pairs_json)
         save_result = save_calibration(calibrations_json)
 
-        saved = json.loads(save_result)
+        saved = _loads(save_result)
         assert saved["success"] is True
 
     def test_loop1_idempotent(self, seeded_db):
         """Running Loop 1 twice updates rather than duplicating rows."""
         company_id = seeded_db["company_id"]
-        perf_json = get_campaign_performance(company_id)
-        weights_json = compute_prompt_weights(perf_json, company_id)
-
-        save_prompt_weights(weights_json)
-        save_prompt_weights(weights_json)  # Run again — should upsert, not duplicate
+        perf = get_campaign_performance_obj(company_id)
+        weights = compute_prompt_weights_obj(perf, company_id)
 
-        async def _count():
-            async with aiosqlite.connect(seeded_db["db"]) as db:
-                db.row_factory = aiosqlite.Row
-                cur = await db.execute(
-                    "SELECT COUNT(*) AS cnt FROM prompt_weights WHERE company_id=?",
-                    (company_id,),
-                )
-                row = await cur.fetchone()
-                return row["cnt"]
+        save_prompt_weights_obj(weights)
+        save_prompt_weights_obj(weights)  # Run again — should upsert, not duplicate
 
-        count = asyncio.run(_count())
-        weights = json.loads(weights_json)
-        assert count == len(weights["weight_updates"])
+        row = _query_scalar(
+            seeded_db["read_conn"],
+            "SELECT COUNT(*) AS cnt FROM prompt_weights WHERE company_id=?",
+            (company_id,),
+        )
+        assert row["cnt"] == len(weights["weight_updates"])
 
 
 # =============================================================================
@@ -633,14 +695,10 @@ class TestToolPipelines:
 # =============================================================================
 
 @pytest.mark.integration
+@pytest.mark.requires_gemini
 class TestFeedbackLoopAgentIntegration:
     """Full end-to-end agent runs. Require GEMINI_API_KEY."""
 
-    @pytest.fixture(autouse=True)
-    def check_api_key(self):
-        if not settings.gemini_api_key_set:
-            pytest.skip("GEMINI_API_KEY not set — skipping integration tests")
-
     @pytest.mark.asyncio
     async def test_run_loop2_and_loop3_only(self, seeded_db):
         """Run the full agent with only Loop 2 and Loop 3 (no company_id needed)."""
@@ -3,7 +3,8 @@ Tests for Agent 6 — Content Strategy Agent
 
 Test layers:
   1. Unit tests     — no API key required (models + tools in isolation)
-  2. Integration    — DB persistence with temp SQLite
+  2. Integration    — DB persistence (in-memory SQLite) and agent runs
+                     against replayed Gemini replies
   3. End-to-end     — full ADK agent run (requires GEMINI_API_KEY)
 
 Run all unit tests (no API key needed):
@@ -14,28 +15,16 @@ Run integration tests (no API key needed):
     pytest tests/test_agent6_content_strategy.py -v -m integration
 
 Run e2e (requires GEMINI_API_KEY in .env):
-    pytest tests/test_agent6_content_strategy.py -v -m e2e
+    pytest tests/test_agent6_content_strategy.py -v -m e2e --run-e2e
 """
 from __future__ import annotations
 
 import json
-import os
-import sys
-from pathlib import Path
 
 import pytest
-from dotenv import load_dotenv
-
-_code_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(_code_dir))
-
-_here = Path(__file__).resolve()
-for _parent in [_here.parent, *_here.parents]:
-    _candidate = _parent / ".env"
-    if _candidate.exists():
-        load_dotenv(_candidate)
-        break
+from pydantic import ValidationError
 
+# .env loading and the backend import path are handled once in conftest.py.
 from backend.models.content import (
     ContentStrategy,
     ContentStrategyResponse,
@@ -44,18 +33,20 @@ from backend.models.content import (
 )
 from backend.agents.content_strategy import (
     score_content_format,
+    score_content_format_obj,
     format_strategy_output,
+    format_strategy_output_obj,
     _build_instruction,
     _extract_strategies,
 )
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Fixtures
+# Fixtures — module-scoped and shared read-only; copy before mutating in a test
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_strategy_input() -> dict:
     return {
         "content_type": "linkedin_article",
@@ -83,13 +74,9 @@ class TestContentType:
         assert {t.value for t in ContentType} == expected
 
     def test_content_type_meta_has_all_types(self):
-        for ct in ContentType:
-            assert ct.value in CONTENT_TYPE_META
-            meta = CONTENT_TYPE_META[ct.value]
-            assert "label" in meta
-            assert "channel" in meta
-            assert "typical_length" in meta
-            assert "visual_required" in meta
+        required = {"label", "channel", "typical_length", "visual_required"}
+        assert CONTENT_TYPE_META.keys() >= {t.value for t in ContentType}
+        assert all(required <= meta.keys() for meta in CONTENT_TYPE_META.values())
 
 
 @pytest.mark.unit
@@ -120,6 +107,15 @@ class TestContentStrategyModel:
                 priority_score=1.5,
             )
 
+    def test_strategy_is_frozen(self):
+        strat = ContentStrategy(
+            campaign_id="c", company_id="co",
+            content_type=ContentType.BLOG_POST,
+            reasoning="r", target_length="t", tone_direction="t",
+        )
+        with pytest.raises(ValidationError):
+            strat.priority_score = 0.9
+
     def test_to_db_row_serializes_outline(self):
         strat = ContentStrategy(
             campaign_id="c", company_id="co",
@@ -146,6 +142,7 @@ class TestContentStrategyModel:
         assert restored.id == strat.id
         assert restored.content_type == strat.content_type
         assert restored.structure_outline == strat.structure_outline
+        assert restored == strat
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -153,50 +150,42 @@ class TestContentStrategyModel:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+# (kwargs, expected is_valid, substring expected in the issues)
+_SCORE_CASES = [
+    pytest.param(
+        dict(content_type="linkedin_article", audience_fit=0.9, channel_alignment=0.85,
+             production_complexity=0.3, reasoning="B2B audience fits LinkedIn"),
+        True, None, id="valid",
+    ),
+    pytest.param(
+        dict(content_type="podcast_script", audience_fit=0.8, channel_alignment=0.7,
+             production_complexity=0.5, reasoning="test"),
+        False, "podcast_script", id="unknown-content-type",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", audience_fit=1.5, channel_alignment=0.5,
+             production_complexity=0.2, reasoning="test"),
+        False, "audience_fit", id="out-of-range-score",
+    ),
+]
+
+
 @pytest.mark.unit
 class TestScoreContentFormat:
-    def test_valid_input_returns_composite_score(self):
-        result = json.loads(score_content_format(
-            content_type="linkedin_article",
-            audience_fit=0.9,
-            channel_alignment=0.85,
-            production_complexity=0.3,
-            reasoning="B2B audience fits LinkedIn",
-        ))
-        assert result["is_valid"] is True
-        assert result["content_type"] == "linkedin_article"
-        assert 0.0 <= result["composite_score"] <= 1.0
-        assert result["issues"] == []
-
-    def test_unknown_content_type_adds_issue(self):
-        result = json.loads(score_content_format(
-            content_type="podcast_script",
-            audience_fit=0.8,
-            channel_alignment=0.7,
-            production_complexity=0.5,
-            reasoning="test",
-        ))
-        assert result["is_valid"] is False
-        assert "podcast_script" in str(result["issues"])
-
-    def test_out_of_range_scores_add_issues(self):
-        result = json.loads(score_content_format(
-            content_type="blog_post",
-            audience_fit=1.5,
-            channel_alignment=0.5,
-            production_complexity=0.2,
-            reasoning="test",
-        ))
-        assert result["is_valid"] is False
-        assert any("audience_fit" in i for i in result["issues"])
+    @pytest.mark.parametrize("kwargs, expected_valid, issue_substr", _SCORE_CASES)
+    def test_scoring(self, kwargs, expected_valid, issue_substr):
+        result = score_content_format_obj(**kwargs)
+        assert result["is_valid"] is expected_valid
+        assert result["content_type"] == kwargs["content_type"]
+        if expected_valid:
+            assert result["issues"] == []
+            assert 0.0 <= result["composite_score"] <= 1.0
+        else:
+            assert any(issue_substr in i for i in result["issues"])
 
     def test_low_complexity_boosts_composite(self):
-        low = json.loads(score_content_format(
-            "blog_post", 0.8, 0.8, 0.1, "easy"
-        ))
-        high = json.loads(score_content_format(
-            "blog_post", 0.8, 0.8, 0.9, "hard"
-        ))
+        low = score_content_format_obj("blog_post", 0.8, 0.8, 0.1, "easy")
+        high = score_content_format_obj("blog_post", 0.8, 0.8, 0.9, "hard")
         assert low["composite_score"] > high["composite_score"]
 
 
@@ -208,8 +197,7 @@ class TestScoreContentFormat:
 @pytest.mark.unit
 class TestFormatStrategyOutput:
     def test_valid_json_array_produces_strategies(self, sample_strategy_input):
-        raw = json.dumps([sample_strategy_input])
-        result = json.loads(format_strategy_output(raw, "camp-001", "co-001"))
+        result = format_strategy_output_obj([sample_strategy_input], "camp-001", "co-001")
         assert result["count"] == 1
         assert result["campaign_id"] == "camp-001"
         strat = result["strategies"][0]
@@ -218,22 +206,21 @@ class TestFormatStrategyOutput:
         assert strat["company_id"] == "co-001"
 
     def test_wrapped_dict_with_strategies_key(self, sample_strategy_input):
-        raw = json.dumps({"strategies": [sample_strategy_input]})
-        result = json.loads(format_strategy_output(raw, "camp-002", "co-002"))
+        result = format_strategy_output_obj(
+            {"strategies": [sample_strategy_input]}, "camp-002", "co-002"
+        )
         assert result["count"] == 1
         assert result["strategies"][0]["campaign_id"] == "camp-002"
 
     def test_invalid_json_returns_error(self):
-        result = json.loads(format_strategy_output("not json {{{", "c", "co"))
+        result = format_strategy_output_obj("not json {{{", "c", "co")
         assert "error" in result
         assert result["count"] == 0
 
     def test_unknown_content_type_falls_back_to_blog_post(self):
         inp = {"content_type": "unknown_format", "reasoning": "r",
                "target_length": "t", "tone_direction": "t"}
-        result = json.loads(format_strategy_output(
-            json.dumps([inp]), "c", "co"
-        ))
+        result = format_strategy_output_obj([inp], "c", "co")
         assert result["count"] == 1
         assert result["strategies"][0]["content_type"] == "blog_post"
 
@@ -243,12 +230,22 @@ class TestFormatStrategyOutput:
             "reasoning": "r", "target_length": "5", "tone_direction": "t",
             "structure_outline": "Hook, Data, CTA",
         }
-        result = json.loads(format_strategy_output(
-            json.dumps([inp]), "c", "co"
-        ))
+        result = format_strategy_output_obj([inp], "c", "co")
         assert result["strategies"][0]["structure_outline"] == ["Hook", "Data", "CTA"]
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("tool, args", [
+    (score_content_format, ("linkedin_article", 0.9, 0.85, 0.3, "fit")),
+    (format_strategy_output, ('[{"content_type": "blog_post"}]', "c", "co")),
+])
+def test_tools_return_json_string(tool, args):
+    """The ADK-facing tools keep their JSON-string contract."""
+    result = tool(*args)
+    assert isinstance(result, str)
+    assert isinstance(json.loads(result), dict)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Unit Tests — _build_instruction
 # ──────────────────────────────────────────────────────────────────────────────
@@ -297,40 +294,61 @@ class TestExtractStrategies:
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_persist_strategies_writes_to_db(tmp_path):
-    import aiosqlite
-    import backend.database as db_module
-    from backend.database import init_db
+async def test_persist_strategies_writes_to_db(db_conn):
     from backend.agents.content_strategy import _persist_strategies
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
+    strategies = [
+        ContentStrategy(
+            campaign_id="camp-1",
+            company_id="co-1",
+            content_type=content_type,
+            reasoning="Blog fits SEO goals",
+            target_length="1200 words",
+            tone_direction="authoritative",
+            structure_outline=["Intro", "Body", "Conclusion"],
+            priority_score=0.8,
+        )
+        for content_type in (ContentType.BLOG_POST, ContentType.NEWSLETTER, ContentType.TWEET_THREAD)
+    ]
+    await _persist_strategies(strategies)
 
-    try:
-        await init_db(test_db)
-        strategies = [
-            ContentStrategy(
-                campaign_id="camp-1",
-                company_id="co-1",
-                content_type=ContentType.BLOG_POST,
-                reasoning="Blog fits SEO goals",
-                target_length="1200 words",
-                tone_direction="authoritative",
-                structure_outline=["Intro", "Body", "Conclusion"],
-                priority_score=0.8,
-            ),
-        ]
-        await _persist_strategies(strategies)
-
-        async with aiosqlite.connect(test_db) as db:
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM content_strategies"
-            )
-            count = (await cursor.fetchone())[0]
-        assert count == 1
-    finally:
-        db_module.DB_PATH = original
+    count = db_conn.execute("SELECT COUNT(*) FROM content_strategies").fetchone()[0]
+    assert count == 3
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_agent_run_with_replayed_gemini(
+    gemini_replay, content_strategy_agent, sample_strategy_input, monkeypatch
+):
+    """Full runner path with the Gemini call replayed from a canned reply."""
+    import itertools
+
+    import backend.agents.content_strategy as agent_module
+    from backend.agents.content_strategy import run_content_strategy_agent
+
+    # Fake the runner's clock: each reading advances 123 ms.
+    monkeypatch.setattr(agent_module, "_clock", itertools.count(0.0, 0.123).__next__)
+    gemini_replay.append(f"```json\n{json.dumps({'strategies': [sample_strategy_input]})}\n```")
+    response = await run_content_strategy_agent(
+        campaign_id="test-camp-001",
+        company_id="test-co-001",
+        headline="AI Coding Tools Won't Replace You",
+        body_copy="Prediction markets signal rising confidence in AI augmentation.",
+        channel_recommendation="linkedin",
+        company_name="NovaTech",
+        persist=False,
+        agent=content_strategy_agent,
+    )
+
+    assert isinstance(response, ContentStrategyResponse)
+    assert response.success
+    assert response.latency_ms == 123
+    assert len(response.strategies) == 1
+    strat = response.strategies[0]
+    assert strat.content_type == ContentType.LINKEDIN_ARTICLE
+    assert strat.campaign_id == "test-camp-001"
+    assert strat.company_id == "test-co-001"
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -338,46 +356,34 @@ async def test_persist_strategies_writes_to_db(tmp_path):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _gemini_key_available() -> bool:
-    key = os.getenv("GEMINI_API_KEY", "")
-    return bool(key) and key != "your_gemini_api_key_here"
-
-
 @pytest.mark.e2e
 @pytest.mark.asyncio
-@pytest.mark.skipif(not _gemini_key_available(), reason="GEMINI_API_KEY not configured")
-async def test_full_agent_run_returns_strategies(tmp_path):
-    import backend.database as db_module
+@pytest.mark.requires_gemini
+async def test_full_agent_run_returns_strategies(temp_db, content_strategy_agent):
     from backend.agents.content_strategy import run_content_strategy_agent
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
-
-    try:
-        response = await run_content_strategy_agent(
-            campaign_id="test-camp-001",
-            company_id="test-co-001",
-            headline="AI Coding Tools Won't Replace You — They'll Make You Dangerous",
-            body_copy="As prediction markets signal rising confidence in AI augmentation over replacement, now is the time to position your developer tools brand.",
-            channel_recommendation="linkedin",
-            company_name="NovaTech",
-            industry="SaaS / Developer Tools",
-            tone="bold, technical",
-            audience="software engineers",
-            goals="drive sign-ups",
-            persist=False,
-        )
-
-        assert isinstance(response, ContentStrategyResponse)
-        assert response.success
-        assert len(response.strategies) >= 1
-        assert response.latency_ms > 0
-
-        for s in response.strategies:
-            assert isinstance(s, ContentStrategy)
-            assert s.content_type in ContentType
-            assert 0.0 <= s.priority_score <= 1.0
-            assert s.campaign_id == "test-camp-001"
-    finally:
-        db_module.DB_PATH = original
+    response = await run_content_strategy_agent(
+        campaign_id="test-camp-001",
+        company_id="test-co-001",
+        headline="AI Coding Tools Won't Replace You — They'll Make You Dangerous",
+        body_copy="As prediction markets signal rising confidence in AI augmentation over replacement, now is the time to position your developer tools brand.",
+        channel_recommendation="linkedin",
+        company_name="NovaTech",
+        industry="SaaS / Developer Tools",
+        tone="bold, technical",
+        audience="software engineers",
+        goals="drive sign-ups",
+        persist=False,
+        agent=content_strategy_agent,
+    )
+
+    assert isinstance(response, ContentStrategyResponse)
+    assert response.success
+    assert len(response.strategies) >= 1
+    assert response.latency_ms > 0
+
+    for s in response.strategies:
+        assert isinstance(s, ContentStrategy)
+        assert s.content_type in ContentType
+        assert 0.0 <= s.priority_score <= 1.0
+        assert s.campaign_id == "test-camp-001"
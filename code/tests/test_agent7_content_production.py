@@ -3,7 +3,8 @@ Tests for Agent 7 — Content Production Agent
 
 Test layers:
   1. Unit tests     — no API key required (models + tools in isolation)
-  2. Integration    — DB persistence with temp SQLite
+  2. Integration    — DB persistence (in-memory SQLite) and agent runs
+                     against replayed Gemini replies
   3. End-to-end     — full ADK agent run (requires GEMINI_API_KEY)
 
 Run all unit tests (no API key needed):
@@ -14,28 +15,15 @@ Run integration tests (no API key needed):
     pytest tests/test_agent7_content_production.py -v -m integration
 
 Run e2e (requires GEMINI_API_KEY in .env):
-    pytest tests/test_agent7_content_production.py -v -m e2e
+    pytest tests/test_agent7_content_production.py -v -m e2e --run-e2e
 """
 from __future__ import annotations
 
 import json
-import os
-import sys
-from pathlib import Path
 
 import pytest
-from dotenv import load_dotenv
-
-_code_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(_code_dir))
-
-_here = Path(__file__).resolve()
-for _parent in [_here.parent, *_here.parents]:
-    _candidate = _parent / ".env"
-    if _candidate.exists():
-        load_dotenv(_candidate)
-        break
 
+# .env loading and the backend import path are handled once in conftest.py.
 from backend.models.content import (
     ContentPiece,
     ContentProductionResponse,
@@ -44,18 +32,20 @@ from backend.models.content import (
 )
 from backend.agents.content_production import (
     validate_content_piece,
+    validate_content_piece_obj,
     format_content_output,
+    format_content_output_obj,
     _build_instruction,
     _extract_pieces,
 )
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Fixtures
+# Fixtures — module-scoped and shared read-only; copy before mutating in a test
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_strategy() -> ContentStrategy:
     return ContentStrategy(
         id="strat-001",
@@ -71,7 +61,7 @@ def sample_strategy() -> ContentStrategy:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_piece_input() -> dict:
     return {
         "content_type": "tweet_thread",
@@ -146,6 +136,7 @@ class TestContentPieceModel:
         restored = ContentPiece.from_db_row(row)
         assert restored.id == piece.id
         assert restored.title == piece.title
+        assert restored == piece
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -153,67 +144,52 @@ class TestContentPieceModel:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+_VALID_BODY = "This is a valid body with more than fifty characters to pass the minimum length check."
+
+# (kwargs, expected is_valid, substring expected in one of the issues — lowercase)
+_VALIDATION_CASES = [
+    pytest.param(
+        dict(content_type="blog_post", title="Valid Title", body=_VALID_BODY, word_count=500),
+        True, None, id="valid",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", title="", body="A" * 100, word_count=50),
+        False, "title", id="empty-title",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", title="Title", body="Short", word_count=5),
+        False, "short", id="short-body",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", title="Title", body="Lorem ipsum dolor sit amet " * 5, word_count=50),
+        False, "placeholder", id="placeholder-text",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", title="Title", body=_VALID_BODY + " [Placeholder]", word_count=500),
+        False, "placeholder", id="placeholder-marker",
+    ),
+    pytest.param(
+        dict(content_type="blog_post", title="Title", body="Short blog " * 30, word_count=250),
+        False, "blog post too short", id="blog-post-too-short",
+    ),
+    pytest.param(
+        dict(content_type="linkedin_article", title="Title", body="Short " * 30, word_count=150),
+        False, "linkedin", id="linkedin-article-too-short",
+    ),
+]
+
+
 @pytest.mark.unit
 class TestValidateContentPiece:
-    def test_valid_content_passes(self):
-        result = json.loads(validate_content_piece(
-            content_type="blog_post",
-            title="Valid Title",
-            body="This is a valid body with more than fifty characters to pass the minimum length check.",
-            word_count=500,
-        ))
-        assert result["is_valid"] is True
-        assert result["issues"] == []
-        assert result["quality_score"] >= 0.9
-
-    def test_empty_title_fails(self):
-        result = json.loads(validate_content_piece(
-            content_type="blog_post",
-            title="",
-            body="A" * 100,
-            word_count=50,
-        ))
-        assert result["is_valid"] is False
-        assert any("title" in i.lower() for i in result["issues"])
-
-    def test_short_body_fails(self):
-        result = json.loads(validate_content_piece(
-            content_type="blog_post",
-            title="Title",
-            body="Short",
-            word_count=5,
-        ))
-        assert result["is_valid"] is False
-        assert any("short" in i.lower() or "50" in i for i in result["issues"])
-
-    def test_placeholder_text_fails(self):
-        result = json.loads(validate_content_piece(
-            content_type="blog_post",
-            title="Title",
-            body="Lorem ipsum dolor sit amet " * 5,
-            word_count=50,
-        ))
-        assert result["is_valid"] is False
-        assert any("placeholder" in i.lower() or "lorem" in i.lower() for i in result["issues"])
-
-    def test_blog_post_too_short(self):
-        result = json.loads(validate_content_piece(
-            content_type="blog_post",
-            title="Title",
-            body="Short blog " * 30,
-            word_count=250,
-        ))
-        assert result["is_valid"] is False
-        assert any("300" in i or "short" in i.lower() for i in result["issues"])
-
-    def test_linkedin_article_too_short(self):
-        result = json.loads(validate_content_piece(
-            content_type="linkedin_article",
-            title="Title",
-            body="Short " * 30,
-            word_count=150,
-        ))
-        assert result["is_valid"] is False
+    @pytest.mark.parametrize("kwargs, expected_valid, issue_substr", _VALIDATION_CASES)
+    def test_validation(self, kwargs, expected_valid, issue_substr):
+        result = validate_content_piece_obj(**kwargs)
+        assert result["is_valid"] is expected_valid
+        if expected_valid:
+            assert result["issues"] == []
+            assert result["quality_score"] >= 0.9
+        else:
+            assert any(issue_substr in i.lower() for i in result["issues"])
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -224,10 +200,9 @@ class TestValidateContentPiece:
 @pytest.mark.unit
 class TestFormatContentOutput:
     def test_valid_json_produces_pieces(self, sample_piece_input, sample_strategy):
-        raw = json.dumps([sample_piece_input])
-        result = json.loads(format_content_output(
-            raw, sample_strategy.id, sample_strategy.campaign_id, sample_strategy.company_id
-        ))
+        result = format_content_output_obj(
+            [sample_piece_input], sample_strategy.id, sample_strategy.campaign_id, sample_strategy.company_id
+        )
         assert result["count"] == 1
         assert result["strategy_id"] == sample_strategy.id
         piece = result["pieces"][0]
@@ -236,24 +211,24 @@ class TestFormatContentOutput:
         assert piece["title"] == sample_piece_input["title"]
 
     def test_wrapped_dict_with_pieces_key(self, sample_piece_input, sample_strategy):
-        raw = json.dumps({"pieces": [sample_piece_input]})
-        result = json.loads(format_content_output(
-            raw, "strat-1", "camp-1", "co-1"
-        ))
+        result = format_content_output_obj(
+            {"pieces": [sample_piece_input]}, "strat-1", "camp-1", "co-1"
+        )
         assert result["count"] == 1
 
     def test_content_pieces_key_alias(self, sample_piece_input, sample_strategy):
-        raw = json.dumps({"content_pieces": [sample_piece_input]})
-        result = json.loads(format_content_output(raw, "s", "c", "co"))
+        result = format_content_output_obj(
+            {"content_pieces": [sample_piece_input]}, "s", "c", "co"
+        )
         assert result["count"] == 1
 
     def test_invalid_json_returns_error(self, sample_strategy):
-        result = json.loads(format_content_output(
+        result = format_content_output_obj(
             "not json {{{",
             sample_strategy.id,
             sample_strategy.campaign_id,
             sample_strategy.company_id,
-        ))
+        )
         assert "error" in result
         assert result["count"] == 0
 
@@ -263,14 +238,26 @@ class TestFormatContentOutput:
             "title": "Thread",
             "body": ["Tweet 1", "Tweet 2", "Tweet 3"],
         }
-        result = json.loads(format_content_output(
-            json.dumps([inp]), sample_strategy.id, "c", "co"
-        ))
+        result = format_content_output_obj(
+            [inp], sample_strategy.id, "c", "co"
+        )
         assert result["count"] == 1
         body = result["pieces"][0]["body"]
         assert "Tweet 1" in body
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("tool, args", [
+    (validate_content_piece, ("blog_post", "Title", "Body " * 20, 500)),
+    (format_content_output, ('[{"title": "T", "body": "B"}]', "s", "c", "co")),
+])
+def test_tools_return_json_string(tool, args):
+    """The ADK-facing tools keep their JSON-string contract."""
+    result = tool(*args)
+    assert isinstance(result, str)
+    assert isinstance(json.loads(result), dict)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Unit Tests — _build_instruction
 # ──────────────────────────────────────────────────────────────────────────────
@@ -294,7 +281,7 @@ class TestBuildInstruction:
         inst = _build_instruction(
             "X", "Y", "Z", "G",
             "blog_post", "1000 words", "formal",
-            ["Intro", "Body", "Conclusion"],
+            ("Intro", "Body", "Conclusion"),
         )
         assert "Intro" in inst
         assert "Body" in inst
@@ -328,37 +315,58 @@ class TestExtractPieces:
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_persist_pieces_writes_to_db(tmp_path, sample_strategy):
-    import aiosqlite
-    import backend.database as db_module
-    from backend.database import init_db
+async def test_persist_pieces_writes_to_db(db_conn, sample_strategy):
     from backend.agents.content_production import _persist_pieces
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
+    pieces = [
+        ContentPiece(
+            strategy_id=sample_strategy.id,
+            campaign_id=sample_strategy.campaign_id,
+            company_id=sample_strategy.company_id,
+            content_type=ContentType.BLOG_POST,
+            title="Test Blog",
+            body="Full blog body with enough content to be valid. " * 50,
+            word_count=500,
+        ),
+    ]
+    await _persist_pieces(pieces)
 
-    try:
-        await init_db(test_db)
-        pieces = [
-            ContentPiece(
-                strategy_id=sample_strategy.id,
-                campaign_id=sample_strategy.campaign_id,
-                company_id=sample_strategy.company_id,
-                content_type=ContentType.BLOG_POST,
-                title="Test Blog",
-                body="Full blog body with enough content to be valid. " * 50,
-                word_count=500,
-            ),
-        ]
-        await _persist_pieces(pieces)
+    count = db_conn.execute("SELECT COUNT(*) FROM content_pieces").fetchone()[0]
+    assert count == 1
 
-        async with aiosqlite.connect(test_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM content_pieces")
-            count = (await cursor.fetchone())[0]
-        assert count == 1
-    finally:
-        db_module.DB_PATH = original
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_agent_run_with_replayed_gemini(
+    gemini_replay, content_production_agent, sample_strategy, sample_piece_input, monkeypatch
+):
+    """Full runner path with the Gemini call replayed from a canned reply."""
+    import itertools
+
+    import backend.agents.content_production as agent_module
+    from backend.config import settings
+    from backend.agents.content_production import run_content_production_agent
+
+    monkeypatch.setattr(settings, "ENABLE_GEMINI_MEDIA", False)
+    # Fake the runner's clock: each reading advances 123 ms.
+    monkeypatch.setattr(agent_module, "_clock", itertools.count(0.0, 0.123).__next__)
+    gemini_replay.append(f"```json\n{json.dumps({'pieces': [sample_piece_input]})}\n```")
+    response = await run_content_production_agent(
+        strategy=sample_strategy,
+        campaign_headline="AI Coding Tools Won't Replace You",
+        campaign_body_copy="Prediction markets signal rising confidence in AI augmentation.",
+        company_name="NovaTech",
+        persist=False,
+        agent=content_production_agent,
+    )
+
+    assert isinstance(response, ContentProductionResponse)
+    assert response.success
+    assert response.latency_ms == 123
+    assert len(response.pieces) == 1
+    piece = response.pieces[0]
+    assert piece.title == sample_piece_input["title"]
+    assert piece.strategy_id == sample_strategy.id
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -366,48 +374,36 @@ async def test_persist_pieces_writes_to_db(tmp_path, sample_strategy):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _gemini_key_available() -> bool:
-    key = os.getenv("GEMINI_API_KEY", "")
-    return bool(key) and key != "your_gemini_api_key_here"
-
-
 @pytest.mark.e2e
 @pytest.mark.asyncio
-@pytest.mark.skipif(not _gemini_key_available(), reason="GEMINI_API_KEY not configured")
-async def test_full_agent_run_returns_pieces(tmp_path, sample_strategy):
+@pytest.mark.requires_gemini
+async def test_full_agent_run_returns_pieces(temp_db, sample_strategy, content_production_agent):
     from unittest.mock import patch
-    import backend.database as db_module
     from backend.config import settings
     from backend.agents.content_production import run_content_production_agent
 
-    test_db = tmp_path / "signal.db"
-    original = db_module.DB_PATH
-    db_module.DB_PATH = test_db
-
     # Disable media generation for faster e2e test
     with patch.object(settings, "ENABLE_GEMINI_MEDIA", False):
-        try:
-            response = await run_content_production_agent(
-                strategy=sample_strategy,
-                campaign_headline="AI Coding Tools Won't Replace You",
-                campaign_body_copy="As prediction markets signal rising confidence in AI augmentation over replacement.",
-                company_name="NovaTech",
-                tone="bold, technical",
-                audience="software engineers",
-                goals="drive sign-ups",
-                persist=False,
-            )
+        response = await run_content_production_agent(
+            strategy=sample_strategy,
+            campaign_headline="AI Coding Tools Won't Replace You",
+            campaign_body_copy="As prediction markets signal rising confidence in AI augmentation over replacement.",
+            company_name="NovaTech",
+            tone="bold, technical",
+            audience="software engineers",
+            goals="drive sign-ups",
+            persist=False,
+            agent=content_production_agent,
+        )
 
-            assert isinstance(response, ContentProductionResponse)
-            assert response.success
-            assert len(response.pieces) >= 1
-            assert response.latency_ms > 0
-
-            for p in response.pieces:
-                assert isinstance(p, ContentPiece)
-                assert p.content_type in ContentType
-                assert p.title
-                assert len(p.body) >= 50
-                assert p.strategy_id == sample_strategy.id
-        finally:
-            db_module.DB_PATH = original
+        assert isinstance(response, ContentProductionResponse)
+        assert response.success
+        assert len(response.pieces) >= 1
+        assert response.latency_ms > 0
+
+        for p in response.pieces:
+            assert isinstance(p, ContentPiece)
+            assert p.content_type in ContentType
+            assert p.title
+            assert len(p.body) >= 50
+            assert p.strategy_id == sample_strategy.id
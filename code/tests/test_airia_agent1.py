@@ -13,7 +13,6 @@ Run:
 import json
 import os
 import sys
-import time
 from pathlib import Path
 
 _root = Path(__file__).resolve().parents[2]
@@ -63,6 +62,13 @@ Campaign Goals: increase app subscriptions and build trust with clinical credibi
 Competitors: Noom, Calm, MyFitnessPal"""
 
 
+# Request bodies serialised once at import; several tests reuse the same input
+_BODIES = {
+    text: json.dumps({"userInput": text, "asyncOutput": False}).encode()
+    for text in (FINTECH_INPUT, SAAS_INPUT, HEALTHTECH_INPUT)
+}
+
+
 # ---------------------------------------------------------------
 # Helper
 # ---------------------------------------------------------------
@@ -73,43 +79,62 @@ def _divider(title: str) -> None:
     print(f"{'=' * 60}")
 
 
+# Only legacy Windows consoles need unmappable chars replaced; UTF-8 stdout prints as-is.
+_NEEDS_CP1252 = (getattr(sys.stdout, "encoding", "") or "").lower() in {"cp1252", "windows-1252"}
+
+
 def _safe_print(text: str) -> None:
     """Print text safely on Windows cp1252 terminals by replacing unmappable chars."""
-    safe = text.encode("cp1252", errors="replace").decode("cp1252")
-    print(safe)
-
+    print(text.encode("cp1252", errors="replace").decode("cp1252") if _NEEDS_CP1252 else text)
 
-def _call_agent(client: AiriaClient, pipeline_id: str, user_input: str, label: str) -> dict:
-    _safe_print(f"\n  Calling: {label}")
-    _safe_print(f"  GUID   : {pipeline_id}")
-    _safe_print(f"  Input  : {user_input[:80].strip()}...")
 
-    result = client.run_pipeline(
-        pipeline_id=pipeline_id,
-        user_input=user_input,
-        async_output=False,
-    )
+def _report(pipeline_id: str, user_input: str, label: str, result: dict) -> list[str]:
+    """Format one pipeline result as report lines."""
+    lines = [
+        f"\n  Calling: {label}",
+        f"  GUID   : {pipeline_id}",
+        f"  Input  : {user_input[:80].strip()}...",
+    ]
 
     output = result.get("pipelineOutput", result.get("output", str(result)))
     latency = result.get("latency_ms", "N/A")
 
-    _safe_print(f"\n  Latency: {latency}ms")
-    _safe_print("  Output :\n")
-
-    # Pretty-print if JSON, else plain text
-    try:
-        parsed = json.loads(output) if isinstance(output, str) else output
-        _safe_print(json.dumps(parsed, indent=4, ensure_ascii=False))
-    except (json.JSONDecodeError, TypeError):
-        _safe_print(f"  {output}")
+    lines.append(f"\n  Latency: {latency}ms")
+    lines.append("  Output :\n")
+
+    # Pretty-print if JSON, else plain text; only bare strings need parsing first
+    if isinstance(output, (dict, list)):
+        lines.append(json.dumps(output, indent=4, ensure_ascii=False))
+    elif isinstance(output, str):
+        try:
+            lines.append(json.dumps(json.loads(output), indent=4, ensure_ascii=False))
+        except ValueError:
+            lines.append(f"  {output}")
+    else:
+        lines.append(f"  {output}")
 
-    return result
+    return lines
 
 
 # ---------------------------------------------------------------
 # Test Suite
 # ---------------------------------------------------------------
 
+# (title, pipeline GUID, input, label, pass message) — independent calls, sent as one batch
+_TESTS = [
+    ("Test 1: Agent 1 (Brand Intake) - Fintech Company",
+     AGENT1_GUID, FINTECH_INPUT, "Agent 1 (Brand Intake) - Fintech", "Agent 1 responded successfully"),
+    ("Test 2: Agent 1 (Brand Intake) - SaaS Company",
+     AGENT1_GUID, SAAS_INPUT, "Agent 1 (Brand Intake) - SaaS", "Agent 1 responded successfully"),
+    ("Test 3: Agent 1 (Brand Intake) - HealthTech Company",
+     AGENT1_GUID, HEALTHTECH_INPUT, "Agent 1 (Brand Intake) - HealthTech", "Agent 1 responded successfully"),
+    ("Test 4: Battleground Variant - Fintech Company (A/B Compare)",
+     BATTLEGROUND_GUID, FINTECH_INPUT, "Battleground Variant - Fintech", "Battleground agent responded successfully"),
+    ("Test 5: Battleground Variant - SaaS Company (A/B Compare)",
+     BATTLEGROUND_GUID, SAAS_INPUT, "Battleground Variant - SaaS", "Battleground agent responded successfully"),
+]
+
+
 def run_tests():
     _divider("SIGNAL - Airia Agent 1 + Battleground Live Test")
     api_key = os.getenv("AIRIA_API_KEY", "")
@@ -120,63 +145,20 @@ def run_tests():
     passed = 0
     failed = 0
 
-    # ── Test 1: Agent 1 — Fintech company onboarding ────────────
-    _divider("Test 1: Agent 1 (Brand Intake) - Fintech Company")
-    try:
-        _call_agent(client, AGENT1_GUID, FINTECH_INPUT, "Agent 1 (Brand Intake) - Fintech")
-        _safe_print("\n  [PASS] Agent 1 responded successfully")
-        passed += 1
-    except Exception as e:
-        _safe_print(f"\n  [FAIL] {type(e).__name__}: {e}")
-        failed += 1
-
-    time.sleep(1)
-
-    # ── Test 2: Agent 1 — SaaS company onboarding ───────────────
-    _divider("Test 2: Agent 1 (Brand Intake) - SaaS Company")
-    try:
-        _call_agent(client, AGENT1_GUID, SAAS_INPUT, "Agent 1 (Brand Intake) - SaaS")
-        _safe_print("\n  [PASS] Agent 1 responded successfully")
-        passed += 1
-    except Exception as e:
-        _safe_print(f"\n  [FAIL] {type(e).__name__}: {e}")
-        failed += 1
-
-    time.sleep(1)
-
-    # ── Test 3: Agent 1 — HealthTech company onboarding ─────────
-    _divider("Test 3: Agent 1 (Brand Intake) - HealthTech Company")
-    try:
-        _call_agent(client, AGENT1_GUID, HEALTHTECH_INPUT, "Agent 1 (Brand Intake) - HealthTech")
-        _safe_print("\n  [PASS] Agent 1 responded successfully")
-        passed += 1
-    except Exception as e:
-        _safe_print(f"\n  [FAIL] {type(e).__name__}: {e}")
-        failed += 1
-
-    time.sleep(1)
-
-    # ── Test 4: Battleground — same Fintech input, different agent ──
-    _divider("Test 4: Battleground Variant - Fintech Company (A/B Compare)")
-    try:
-        _call_agent(client, BATTLEGROUND_GUID, FINTECH_INPUT, "Battleground Variant - Fintech")
-        _safe_print("\n  [PASS] Battleground agent responded successfully")
-        passed += 1
-    except Exception as e:
-        _safe_print(f"\n  [FAIL] {type(e).__name__}: {e}")
-        failed += 1
-
-    time.sleep(1)
+    results = client.run_pipelines_batch(
+        [(guid, _BODIES[user_input]) for _, guid, user_input, _, _ in _TESTS],
+        return_exceptions=True,
+    )
 
-    # ── Test 5: Battleground — same SaaS input, side-by-side comparison ──
-    _divider("Test 5: Battleground Variant - SaaS Company (A/B Compare)")
-    try:
-        _call_agent(client, BATTLEGROUND_GUID, SAAS_INPUT, "Battleground Variant - SaaS")
-        _safe_print("\n  [PASS] Battleground agent responded successfully")
+    for (title, guid, user_input, label, ok_msg), result in zip(_TESTS, results):
+        _divider(title)
+        if isinstance(result, Exception):
+            _safe_print(f"\n  [FAIL] {type(result).__name__}: {result}")
+            failed += 1
+            continue
+        _safe_print("\n".join(_report(guid, user_input, label, result)))
+        _safe_print(f"\n  [PASS] {ok_msg}")
         passed += 1
-    except Exception as e:
-        _safe_print(f"\n  [FAIL] {type(e).__name__}: {e}")
-        failed += 1
 
     # ── Summary ───────────────────────────────────────────────────
     print(f"\n{'=' * 60}")
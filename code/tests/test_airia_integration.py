@@ -3,10 +3,13 @@ SIGNAL - Airia Integration Test (Standalone)
 =============================================
 Tests the Airia integration independently:
   1. API key is loaded correctly
-  2. Airia API is reachable (connectivity check)
-  3. Authentication is valid (key is accepted)
+  2. AiriaClient can be instantiated
+  3. Airia API is reachable and the key is accepted (connectivity + auth)
   4. AiriaGateway shows which pipelines are/aren't configured
-  5. (Optional) Live pipeline execution - if AIRIA_PIPELINE_BRAND_INTAKE is set
+  5. Calling an unconfigured pipeline raises a clear error
+  6. (Optional) Live pipeline execution - if AIRIA_PIPELINE_BRAND_INTAKE is set
+  7. Opt-in response cache (AIRIA_TEST_CACHE=1) short-circuits repeat calls (offline)
+  8. Batch execution returns results in input order (offline)
 
 Run this directly:
     python code/tests/test_airia_integration.py
@@ -14,8 +17,10 @@ Run this directly:
 Or via pytest:
     pytest code/tests/test_airia_integration.py -v
 """
-import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # Make sure we can import the backend from any working directory
@@ -36,13 +41,46 @@ from backend.config import settings
 
 
 # ---------------------------------------------------------------
-# Helper: print a clearly formatted test banner
+# Shared client: one pooled HTTP session for the whole run
 # ---------------------------------------------------------------
 
+@pytest.fixture(scope="session")
+def airia_client():
+    client = AiriaClient()
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="module")
+def gateway(airia_client):
+    """One AiriaGateway on the shared client; it reads pipeline GUIDs from env per call."""
+    return AiriaGateway(client=airia_client)
+
+
+@pytest.fixture(scope="session")
+def airia_connectivity(airia_client):
+    """One connectivity/auth probe per session, shared by every live test."""
+    return airia_client.test_connectivity()
+
+
+@pytest.fixture(scope="session")
+def airia_live(airia_connectivity):
+    """Skip live-execution tests up front when the probe failed, instead of one dead call each."""
+    if not (airia_connectivity["connected"] and airia_connectivity["auth_valid"]):
+        pytest.skip(f"Airia API not usable: {airia_connectivity['message']}")
+    return True
+
+
+# ---------------------------------------------------------------
+# Helper: a clearly formatted test banner
+# ---------------------------------------------------------------
+
+def _banner_lines(title: str) -> list[str]:
+    return [f"\n{'-' * 55}", f"  {title}", f"{'-' * 55}"]
+
+
 def _banner(title: str) -> None:
-    print(f"\n{'-' * 55}")
-    print(f"  {title}")
-    print(f"{'-' * 55}")
+    print("\n".join(_banner_lines(title)))
 
 
 # ---------------------------------------------------------------
@@ -66,10 +104,10 @@ def test_airia_api_key_configured():
 # Test 2 - AiriaClient can be instantiated
 # ---------------------------------------------------------------
 
-def test_airia_client_instantiation():
+def test_airia_client_instantiation(airia_client):
     """AiriaClient should initialise without errors when key is present."""
     _banner("Test 2: Client Instantiation")
-    client = AiriaClient()
+    client = airia_client
     assert client.api_key.startswith("ak-"), (
         f"API key format unexpected (should start with 'ak-'): {client.api_key[:20]}"
     )
@@ -80,37 +118,44 @@ def test_airia_client_instantiation():
 # Test 3 - Connectivity + auth check (live HTTP call)
 # ---------------------------------------------------------------
 
-def test_airia_connectivity():
-    """Hit the Airia API to confirm the key is accepted and the API is reachable."""
-    _banner("Test 3: Connectivity & Auth Check (live HTTP)")
-    client = AiriaClient()
-    result = client.test_connectivity()
-
-    print(f"  Connected    : {result['connected']}")
-    print(f"  Auth Valid   : {result['auth_valid']}")
-    print(f"  Status Code  : {result['status_code']}")
-    print(f"  Latency      : {result['latency_ms']}ms")
-    print(f"  Message      : {result['message']}")
+def _check_connectivity(result: dict, lines: list[str]) -> None:
+    """Assert on a connectivity probe result, appending its report to ``lines``."""
+    lines += _banner_lines("Test 3: Connectivity & Auth Check (live HTTP)")
+    lines += [
+        f"  Connected    : {result['connected']}",
+        f"  Auth Valid   : {result['auth_valid']}",
+        f"  Status Code  : {result['status_code']}",
+        f"  Latency      : {result['latency_ms']}ms",
+        f"  Message      : {result['message']}",
+    ]
 
     assert result["connected"], f"Cannot reach Airia API: {result['message']}"
     assert result["auth_valid"], (
         f"Airia rejected the API key ({result['status_code']}): {result['message']}"
     )
-    print("  [PASS] Connected and authenticated!")
+    lines.append("  [PASS] Connected and authenticated!")
+
+
+def test_airia_connectivity(airia_connectivity):
+    """Hit the Airia API to confirm the key is accepted and the API is reachable."""
+    lines: list[str] = []
+    try:
+        _check_connectivity(airia_connectivity, lines)
+    finally:
+        print("\n".join(lines))
 
 
 # ---------------------------------------------------------------
 # Test 4 - AiriaGateway pipeline configuration status
 # ---------------------------------------------------------------
 
-def test_airia_gateway_pipeline_status():
+def test_airia_gateway_pipeline_status(gateway):
     """
     AiriaGateway.configured_agents() should show which pipelines are ready.
     At this stage (before Airia Studio setup) all will be False - that is expected.
     """
     _banner("Test 4: Gateway Pipeline Configuration Status")
-    gw = AiriaGateway()
-    status = gw.configured_agents()
+    status = gateway.configured_agents()
 
     print("  Pipeline GUID configuration status:")
     for agent, is_configured in status.items():
@@ -139,19 +184,18 @@ def test_airia_gateway_pipeline_status():
 # Test 5 - Graceful error when calling unconfigured pipeline
 # ---------------------------------------------------------------
 
-def test_airia_gateway_raises_when_not_configured():
+def test_airia_gateway_raises_when_not_configured(gateway, monkeypatch):
     """
     Calling run_agent() without a pipeline GUID must raise AiriaNotConfiguredError
     with a helpful message - never a silent failure.
     """
     _banner("Test 5: Graceful Error for Unconfigured Pipeline")
-    gw = AiriaGateway()
 
-    # Temporarily ensure the env var is not set for this test
-    os.environ.pop("AIRIA_PIPELINE_BRAND_INTAKE", None)
+    # Unset the env var for this test only (restored afterwards)
+    monkeypatch.delenv("AIRIA_PIPELINE_BRAND_INTAKE", raising=False)
 
     try:
-        gw.run_agent("brand_intake", "test input")
+        gateway.run_agent("brand_intake", "test input")
         assert False, "Should have raised AiriaNotConfiguredError"
     except AiriaNotConfiguredError as e:
         print(f"  [PASS] Caught AiriaNotConfiguredError as expected:")
@@ -163,24 +207,20 @@ def test_airia_gateway_raises_when_not_configured():
 # Only runs if AIRIA_PIPELINE_BRAND_INTAKE is set in .env
 # ---------------------------------------------------------------
 
-def test_airia_live_pipeline_execution():
-    """
-    If AIRIA_PIPELINE_BRAND_INTAKE is set, run a live call through Airia Studio.
-    Skips automatically if the pipeline GUID is not configured.
-    """
-    _banner("Test 6: Live Pipeline Execution (optional)")
-    gw = AiriaGateway()
-    pipeline_id = gw.get_pipeline_id("brand_intake")
+def _check_live_pipeline(gateway: AiriaGateway, lines: list[str]) -> None:
+    """Run the live brand_intake call and assert on it, appending its report to ``lines``."""
+    lines += _banner_lines("Test 6: Live Pipeline Execution (optional)")
+    pipeline_id = gateway.get_pipeline_id("brand_intake")
 
     if not pipeline_id:
-        print("  SKIPPED - AIRIA_PIPELINE_BRAND_INTAKE not set.")
-        print("  Set this env var after creating an agent in Airia Studio to enable this test.")
+        lines.append("  SKIPPED - AIRIA_PIPELINE_BRAND_INTAKE not set.")
+        lines.append("  Set this env var after creating an agent in Airia Studio to enable this test.")
         pytest.skip("AIRIA_PIPELINE_BRAND_INTAKE not configured")
 
-    print(f"  Pipeline GUID: {pipeline_id}")
-    print("  Sending test input to Airia...")
+    lines.append(f"  Pipeline GUID: {pipeline_id}")
+    lines.append("  Sending test input to Airia...")
 
-    result = gw.run_agent(
+    result = gateway.run_agent(
         "brand_intake",
         user_input=(
             "Onboard a test company: Name=TestCorp, Industry=SaaS, "
@@ -188,53 +228,185 @@ def test_airia_live_pipeline_execution():
         ),
     )
 
-    print(f"  Latency      : {result.get('latency_ms', 'N/A')}ms")
-    print(f"  Output       : {str(result.get('pipelineOutput', ''))[:200]}")
+    lines.append(f"  Latency      : {result.get('latency_ms', 'N/A')}ms")
+    lines.append(f"  Output       : {str(result.get('pipelineOutput', ''))[:200]}")
     assert "pipelineOutput" in result, f"Expected 'pipelineOutput' in response, got: {result}"
-    print("  [PASS] Live pipeline call succeeded!")
+    lines.append("  [PASS] Live pipeline call succeeded!")
+
+
+def test_airia_live_pipeline_execution(gateway, airia_live):
+    """
+    If AIRIA_PIPELINE_BRAND_INTAKE is set, run a live call through Airia Studio.
+    Skips automatically if the pipeline GUID is not configured, or up front if the
+    session's connectivity probe could not reach/authenticate with the API.
+    """
+    lines: list[str] = []
+    try:
+        _check_live_pipeline(gateway, lines)
+    finally:
+        print("\n".join(lines))
+
+
+# ---------------------------------------------------------------
+# Test 7 - Opt-in response cache (offline, no API key needed)
+# ---------------------------------------------------------------
+
+def test_airia_response_cache(monkeypatch, tmp_path):
+    """With AIRIA_TEST_CACHE=1 a repeated (pipeline, input) call never reaches the API."""
+    from backend.integrations import airia_client as airia_mod
+
+    monkeypatch.setattr(airia_mod, "AIRIA_CACHE_DIR", tmp_path)
+    monkeypatch.setenv("AIRIA_TEST_CACHE", "1")
+    client = AiriaClient(api_key="ak-test")
+    calls = []
+
+    def fake_post(url, **kwargs):
+        calls.append(url)
+        resp = airia_mod.requests.Response()
+        resp.status_code = 200
+        resp._content = b'{"pipelineOutput": "ok"}'
+        return resp
+
+    monkeypatch.setattr(client._session, "post", fake_post)
+
+    first = client.run_pipeline("pipe-1", "same input")
+    second = client.run_pipeline("pipe-1", "same input")
+    client.run_pipeline("pipe-2", "same input")
+    assert second["pipelineOutput"] == first["pipelineOutput"] == "ok"
+    assert second["latency_ms"] == 0  # served from cache, no network time
+    assert len(calls) == 2
+
+    # The same logical request sent pre-serialised shares run_pipeline's entry
+    body = b'{"asyncOutput": false, "userInput": "same input"}'
+    assert client.run_pipeline_raw("pipe-1", body=body) == second
+    assert len(calls) == 2
+
+    monkeypatch.delenv("AIRIA_TEST_CACHE")
+    client.run_pipeline("pipe-1", "same input")
+    client.run_pipeline_raw(pipeline_id="pipe-1", body=body)
+    assert len(calls) == 4
+    client.close()
+
+
+# ---------------------------------------------------------------
+# Test 8 - Batch execution keeps input order (offline)
+# ---------------------------------------------------------------
+
+def test_airia_run_pipelines_batch(monkeypatch):
+    """run_pipelines_batch returns results in input order; failures can be returned in place."""
+    from backend.integrations.airia_client import AiriaError
+
+    client = AiriaClient(api_key="ak-test")
+
+    def fake_run(pipeline_id, user_input, async_output=False, extra_fields=None):
+        if user_input == "bad":
+            raise AiriaError("boom")
+        return {"pipelineOutput": f"{pipeline_id}:{user_input}"}
+
+    monkeypatch.setattr(client, "run_pipeline", fake_run)
+
+    results = client.run_pipelines_batch(
+        [("p1", "a"), ("p2", "bad"), ("p1", "c")], return_exceptions=True
+    )
+    assert results[0] == {"pipelineOutput": "p1:a"}
+    assert isinstance(results[1], AiriaError)
+    assert results[2] == {"pipelineOutput": "p1:c"}
+
+    with pytest.raises(AiriaError):
+        client.run_pipelines_batch([("p1", "bad")])
+    assert client.run_pipelines_batch([]) == []
+    client.close()
 
 
 # ---------------------------------------------------------------
 # CLI entry point - run directly with python
 # ---------------------------------------------------------------
 
+def _run_cli_test(name: str, fn) -> tuple[str, str]:
+    """Run one test function; return (status, message) with status in PASS/SKIP/FAIL/ERROR."""
+    try:
+        fn()
+        return "PASS", ""
+    except pytest.skip.Exception:
+        return "SKIP", f"  [SKIP] {name}"
+    except AssertionError as e:
+        return "FAIL", f"\n  [FAIL] {name}\n    {e}"
+    except Exception as e:
+        return "ERROR", f"\n  [ERROR] {name}\n    {type(e).__name__}: {e}"
+
+
 if __name__ == "__main__":
     print("\n" + "=" * 55)
     print("  SIGNAL - Airia Integration Test Suite")
     print("=" * 55)
 
-    tests = [
+    try:
+        client = AiriaClient()
+        client_error = None
+    except AiriaNotConfiguredError as e:
+        client, client_error = None, e
+
+    def _client_test(fn):
+        """Bind a client-dependent check, or one that reports why no client was built."""
+        if client is not None:
+            return fn
+
+        def _no_client(*args):
+            raise client_error
+
+        return _no_client
+
+    gateway = AiriaGateway(client=client) if client is not None else None
+
+    def _unconfigured_check():
+        with pytest.MonkeyPatch.context() as mp:
+            test_airia_gateway_raises_when_not_configured(gateway, mp)
+
+    local_tests = [
         ("API Key Check",               test_airia_api_key_configured),
-        ("Client Instantiation",        test_airia_client_instantiation),
-        ("Connectivity & Auth",         test_airia_connectivity),
-        ("Gateway Pipeline Status",     test_airia_gateway_pipeline_status),
-        ("Graceful Unconfigured Error", test_airia_gateway_raises_when_not_configured),
-        ("Live Pipeline Execution",     test_airia_live_pipeline_execution),
+        ("Client Instantiation",        _client_test(partial(test_airia_client_instantiation, client))),
+        ("Gateway Pipeline Status",     _client_test(partial(test_airia_gateway_pipeline_status, gateway))),
+        ("Graceful Unconfigured Error", _client_test(_unconfigured_check)),
     ]
+    # Independent live HTTP calls: dispatched together; each check collects its report
+    # lines, which are printed as one block under the lock
+    network_tests = [
+        ("Connectivity & Auth",         _client_test(lambda lines: _check_connectivity(client.test_connectivity(), lines))),
+        ("Live Pipeline Execution",     _client_test(partial(_check_live_pipeline, gateway))),
+    ]
+
+    counts = {"PASS": 0, "SKIP": 0, "FAIL": 0, "ERROR": 0}
+
+    for name, fn in local_tests:
+        status, message = _run_cli_test(name, fn)
+        counts[status] += 1
+        if message:
+            print(message)
+
+    report_lock = threading.Lock()
+
+    def _run_network_test(name: str, check) -> None:
+        lines: list[str] = []
+        status, message = _run_cli_test(name, partial(check, lines))
+        with report_lock:
+            counts[status] += 1
+            if lines:
+                print("\n".join(lines))
+            if message:
+                print(message)
+
+    with ThreadPoolExecutor(max_workers=len(network_tests)) as pool:
+        for future in [pool.submit(_run_network_test, name, fn) for name, fn in network_tests]:
+            future.result()
 
-    passed = 0
-    failed = 0
-    skipped = 0
-
-    for name, fn in tests:
-        try:
-            fn()
-            passed += 1
-        except pytest.skip.Exception:
-            skipped += 1
-            print(f"  [SKIP] {name}")
-        except AssertionError as e:
-            print(f"\n  [FAIL] {name}")
-            print(f"    {e}")
-            failed += 1
-        except Exception as e:
-            print(f"\n  [ERROR] {name}")
-            print(f"    {type(e).__name__}: {e}")
-            failed += 1
+    passed, skipped = counts["PASS"], counts["SKIP"]
+    failed = counts["FAIL"] + counts["ERROR"]
 
     print(f"\n{'=' * 55}")
     print(f"  Results: {passed} passed | {failed} failed | {skipped} skipped")
     print("=" * 55)
 
+    if client is not None:
+        client.close()
     if failed:
         sys.exit(1)